@@ -61,10 +61,12 @@ from .core import FWFFile
 from .core import FWFMultiFile
 from .core import FWFCythonIndexBuilder
 from .core import FWFIndexDict, FWFUniqueIndexDict
+from .core import FWFSortedIndex, FWFSortedIndexBuilder
 from .core import FWFOperator as op
 from .core import to_pandas
 from .core import fwf_open
 from ._cython import BytesDictWithIntListValues
+from ._cython import FixedBytesDictWithIntListValues
 
 version = (0, 1, 0, 'rc1')
 __version__ = "0.1.0"
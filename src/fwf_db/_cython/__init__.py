@@ -2,4 +2,5 @@
 # -*- coding: utf-8 -*-
 # even empty, this file is needed so cython will see the .pxd
 
-from .fwf_mem_optimized_index import BytesDictWithIntListValues
\ No newline at end of file
+from .fwf_mem_optimized_index import BytesDictWithIntListValues
+from .fwf_mem_optimized_index import FixedBytesDictWithIntListValues
\ No newline at end of file
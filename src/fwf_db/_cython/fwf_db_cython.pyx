@@ -39,21 +39,31 @@ C-invocation logic gets used, which might be performance relevant. If you
 want to avoid this uncertainty, prefer cdef which definitely uses C-conventions.
 """
 
+import os
 import sys
 import ctypes
 import array
+from concurrent.futures import ThreadPoolExecutor
 
 cimport cython
 
 import numpy
 cimport numpy
 
+numpy.import_array()
+
 from typing import Callable, Type
-from libc.string cimport strncmp, memcpy
+from libc.string cimport memcmp, memcpy
 from cpython cimport array
+from cpython.mem cimport PyMem_Realloc, PyMem_Free
+from cpython.ref cimport PyObject
+from cpython.dict cimport PyDict_GetItem, PyDict_SetItem
+from cpython.list cimport PyList_Append
 from libc.stdlib cimport atoi
-from libc.stdint cimport uint32_t
+from libc.stdint cimport uint32_t, uint64_t
 
+from ..core.fwf_dict import FWFDict
+from .fwf_mem_optimized_index cimport FixedBytesDictWithIntListValues
 from ..core.fwf_index_like import FWFIndexLike
 from ..core.fwf_view_like import FWFViewLike
 
@@ -102,6 +112,68 @@ cdef const char* _get_virtual_address(mm):
     cdef const unsigned char[:] my_view = mm
     return <const char*>&my_view[0]
 
+
+cdef const unsigned char[:] _pin_buffer(fwf):
+    """A typed memoryview of the file's (mmap) memory. Keep it referenced
+    for as long as the memory is read via raw pointers without the GIL.
+    While the view exists, the mmap can not be released (closing the file
+    raises BufferError).
+    """
+    return fwf._mm
+
+cdef extern from *:
+    """
+    #if defined(_MSC_VER)
+    #include <stdlib.h>
+    #define _fwf_bswap64(x) _byteswap_uint64(x)
+    #elif defined(__BYTE_ORDER__) && (__BYTE_ORDER__ == __ORDER_BIG_ENDIAN__)
+    #define _fwf_bswap64(x) (x)
+    #else
+    #define _fwf_bswap64(x) __builtin_bswap64(x)
+    #endif
+
+    #if defined(__BYTE_ORDER__) && (__BYTE_ORDER__ == __ORDER_BIG_ENDIAN__)
+    #define _FWF_LITTLE_ENDIAN 0
+    #else
+    #define _FWF_LITTLE_ENDIAN 1
+    #endif
+    """
+    uint64_t _fwf_bswap64(uint64_t x) nogil
+    bint _FWF_LITTLE_ENDIAN
+
+
+cdef inline uint64_t _load64_be(const char *p) nogil:
+    """
+    Read 8 bytes from a (potentially) misaligned memory location as big-endian
+    uint64. Comparing these ints, is the same as comparing the 8 bytes with
+    memcmp(), but without the byte-by-byte loop.
+    """
+    cdef uint64_t tmp
+    memcpy(&tmp, p, sizeof(tmp))
+    return _fwf_bswap64(tmp)
+
+
+cdef inline bint _parse_8_digits(const char *p, int *out) nogil:
+    """
+    Convert 8 ascii digits in one go (SWAR), rather then digit by digit.
+    Return False, if any of the 8 bytes is not a digit. Little-endian only.
+    See https://lemire.me/blog/2022/01/21/swar-explained-parsing-eight-digits/
+    """
+    cdef uint64_t val
+    memcpy(&val, p, sizeof(val))
+
+    # All 8 bytes must be in 0x30 - 0x39
+    if ((val & 0xF0F0F0F0F0F0F0F0ULL) | (((val + 0x0606060606060606ULL) & 0xF0F0F0F0F0F0F0F0ULL) >> 4)) != 0x3333333333333333ULL:
+        return False
+
+    val -= 0x3030303030303030ULL
+    val = (val * 10) + (val >> 8)
+    val = (((val & 0x000000FF000000FFULL) * (100 + (1000000ULL << 32))) +
+        (((val >> 16) & 0x000000FF000000FFULL) * (1 + (10000ULL << 32)))) >> 32
+
+    out[0] = <int>val
+    return True
+
 # -----------------------------------------------------------------------------
 # -----------------------------------------------------------------------------
 
@@ -123,6 +195,7 @@ cpdef int str2int(const char* line, int start, int end):
     cdef int ret = 0
     cdef bool minus = False
     cdef char ch = 0
+    cdef int digits = 0
 
     # Skip any leading spaces
     while start < end:
@@ -140,6 +213,11 @@ cpdef int str2int(const char* line, int start, int end):
         elif ch == 43:  # '+'
             start += 1
 
+    # E.g. a 10 digit ID: 8 digits at once, and the remaining 2 one by one
+    while _FWF_LITTLE_ENDIAN and (end - start) >= 8 and _parse_8_digits(line + start, &digits):
+        ret = ret * 100000000 + digits
+        start += 8
+
     while start < end:
         ch = line[start]
         if ch < 0x30 or ch > 0x39:
@@ -184,6 +262,18 @@ cdef class FWFFilterDefinition:
 # -----------------------------------------------------------------------------
 # -----------------------------------------------------------------------------
 
+cdef struct FilterData:
+    int startpos
+    int lastpos
+    int xlen
+    bool upper
+    bool equal
+    const char* value
+    uint64_t value64    # The first 8 bytes of 'value' as big-endian int, if xlen >= 8 (e.g. dates)
+
+# -----------------------------------------------------------------------------
+# -----------------------------------------------------------------------------
+
 cdef class FWFFilters:
     '''Maintain a list of filter conditions, used to efficiently
     filter lines in fwf file'''
@@ -191,10 +281,22 @@ cdef class FWFFilters:
     cdef fwf            # The file specification
     cdef list data      # List of filters
 
+    # The same filters, packed into a plain C array. When scanning millions
+    # of lines, we don't want to iterate over a list of python objects for
+    # every line.
+    cdef FilterData* cdata
+    cdef int count
+
 
     def __init__(self, fwf):
         self.fwf = fwf
         self.data = []
+        self.cdata = NULL
+        self.count = 0
+
+
+    def __dealloc__(self):
+        PyMem_Free(self.cdata)
 
 
     def add_filter(self, field, lower_value, upper_value):
@@ -220,6 +322,23 @@ cdef class FWFFilters:
         if len(value) > 0:
             x = FWFFilterDefinition(startpos, value, upper, equal)
             self.data.append(x)
+            self._append_cdata(x)
+
+
+    cdef _append_cdata(self, FWFFilterDefinition x):
+        """Add the filter to the C array as well. 'value' points into the
+        bytes object, which is kept alive by self.data"""
+
+        cdef const char* value = x.value
+        cdef uint64_t value64 = _load64_be(value) if x.xlen >= 8 else 0
+
+        cdef FilterData* cdata = <FilterData*>PyMem_Realloc(self.cdata, (self.count + 1) * sizeof(FilterData))
+        if cdata == NULL:
+            raise MemoryError()
+
+        self.cdata = cdata
+        self.cdata[self.count] = FilterData(x.startpos, x.lastpos, x.xlen, x.upper, x.equal, value, value64)
+        self.count += 1
 
 # -----------------------------------------------------------------------------
 # -----------------------------------------------------------------------------
@@ -272,7 +391,7 @@ cdef InternalData _init_internal_data(fwf, index_field: str, offset: int):
 # -----------------------------------------------------------------------------
 # -----------------------------------------------------------------------------
 
-cdef bool _cmp_single_filter(const char* line, FWFFilterDefinition filter):
+cdef inline bool _cmp_single_filter(const char* line, const FilterData* filter) nogil:
     """Apply a single 'filter' to 'line'. Return True upon a match.
 
     An 'empty' field (last byte is a spaces) has predetermined meaning: lowest
@@ -282,7 +401,22 @@ cdef bool _cmp_single_filter(const char* line, FWFFilterDefinition filter):
     if line[filter.lastpos] == 32:
         return True
 
-    cdef int rtn = strncmp(line + filter.startpos, filter.value, filter.xlen)
+    # Avoid memcmp() for the most common field sizes: single byte flags,
+    # and dates, timestamps, IDs etc. with 8 bytes or more. For the latter,
+    # compare the first 8 bytes as one (big-endian) int, and only if equal,
+    # the remaining bytes.
+    cdef uint64_t field64
+    cdef int rtn
+    if filter.xlen == 1:
+        rtn = <int>(<unsigned char>line[filter.startpos]) - <int>(<unsigned char>filter.value[0])
+    elif filter.xlen >= 8:
+        field64 = _load64_be(line + filter.startpos)
+        rtn = (field64 > filter.value64) - (field64 < filter.value64)
+        if (rtn == 0) and (filter.xlen > 8):
+            rtn = memcmp(line + filter.startpos + 8, filter.value + 8, filter.xlen - 8)
+    else:
+        rtn = memcmp(line + filter.startpos, filter.value, filter.xlen)
+
     if (rtn == 0) and (filter.equal == True):
         return True
 
@@ -291,6 +425,18 @@ cdef bool _cmp_single_filter(const char* line, FWFFilterDefinition filter):
 # -----------------------------------------------------------------------------
 # -----------------------------------------------------------------------------
 
+cdef inline bool _cmp_cfilters(const char* line, const FilterData* cdata, int count) nogil:
+    """Apply all filters to 'line'. Return True if all filters match
+    (or no filter defined). No python objects involved, hence no GIL needed."""
+
+    cdef int i
+    for i in range(count):
+        if _cmp_single_filter(line, &cdata[i]) == False:
+            return False
+
+    return True
+
+
 cdef bool _cmp_filters(const char* line, FWFFilters filters):
     """Apply all filters to 'line'. Return True if all filters match
     (or no filter defined)"""
@@ -298,16 +444,12 @@ cdef bool _cmp_filters(const char* line, FWFFilters filters):
     if filters is None:
         return True
 
-    for filter in filters.data:
-        if _cmp_single_filter(line, filter) == False:
-            return False
-
-    return True
+    return _cmp_cfilters(line, filters.cdata, filters.count)
 
 # -----------------------------------------------------------------------------
 # -----------------------------------------------------------------------------
 
-cdef next_line(InternalData* params):
+cdef inline void next_line(InternalData* params) nogil:
     """Move on to the next line"""
 
     params.line += params.fwidth
@@ -316,7 +458,7 @@ cdef next_line(InternalData* params):
 # -----------------------------------------------------------------------------
 # -----------------------------------------------------------------------------
 
-cdef bool has_more_lines(InternalData* params):
+cdef inline bool has_more_lines(InternalData* params) nogil:
     """Return True if the file contains more lines"""
 
     return (params.line + params.min_fwidth) < params.file_end
@@ -333,6 +475,22 @@ cdef _field_data(InternalData* params):
 # -----------------------------------------------------------------------------
 # -----------------------------------------------------------------------------
 
+cdef inline void _copy_field(char* dst, const char* src, int size):
+    """memcpy() the field data. For the most common key sizes, the size is
+    a compile-time constant, which allows the C compiler to replace the
+    memcpy() call with a few (e.g. one 64-bit) loads and stores.
+    """
+
+    if size == 8:
+        memcpy(dst, src, 8)
+    elif size == 10:
+        memcpy(dst, src, 10)
+    else:
+        memcpy(dst, src, size)
+
+# -----------------------------------------------------------------------------
+# -----------------------------------------------------------------------------
+
 cdef int _field_data_int(InternalData* params):
     """From the current line, return the 'field' data and convert it to an integer"""
 
@@ -341,38 +499,119 @@ cdef int _field_data_int(InternalData* params):
 # -----------------------------------------------------------------------------
 # -----------------------------------------------------------------------------
 
-def line_numbers(fwf, filters: FWFFilters = None, ar_size: int = 0):
+def drain(fwf) -> int:
+    """Read the first byte of every line, and do nothing else. No python
+    objects are created, hence this is the baseline for any scan of the file,
+    e.g. the time needed to read the file (mmap page faults).
+    """
+
+    cdef const unsigned char[:] buffer = _pin_buffer(fwf)
+    cdef InternalData params = _init_internal_data(fwf, None, 0)
+    cdef unsigned char rtn = 0
+
+    with nogil:
+        while has_more_lines(&params):
+            rtn ^= <unsigned char>params.line[0]
+            next_line(&params)
+
+    return rtn
+
+# -----------------------------------------------------------------------------
+# -----------------------------------------------------------------------------
+
+def line_numbers(fwf, filters: FWFFilters = None, ar_size: int = 0, start: int = 0, stop: None|int = None, threads: None|int = 1):
     """Read the fwf data, apply the filters, and put the line numbers of all
-    that passed, in an array"""
+    that passed, in a numpy int32 array
+
+    Optionally only the lines 'start' to 'stop' (exclusive) are scanned. The
+    scan itself does not hold the GIL, hence (large) files can be split into
+    chunks and scanned by multiple threads in parallel. 'threads' > 1 does
+    exactly that (None: one thread per CPU).
+    """
+
+    if threads is None:
+        threads = os.cpu_count() or 1
+    elif threads < 1:
+        raise ValueError(f"'threads' must be >= 1 or None: {threads}")
+
+    if threads != 1:
+        return _line_numbers_parallel(fwf, filters, ar_size, start, stop, threads)
 
+    cdef const unsigned char[:] buffer = _pin_buffer(fwf)
     cdef InternalData params = _init_internal_data(fwf, None, 0)
     # print(params)
 
+    cdef int _start = max(start, 0)
+    cdef int _stop = fwf.line_count if stop is None else min(stop, fwf.line_count)
+    params.line += <long>_start * params.fwidth
+    params.irow = _start
+
     # The result array of indices (int). We pre-allocate the memory
     # and shrink it later (and only once). The allocated memory is a
     # sequential block of memory, and we can optimize access to the
     # respective index. The pointer gets initialize to point at the
-    # first index.
-    cdef array.array result = array.array('i', [])
-    cdef int _ar_size = ar_size or (fwf.line_count + 1)
-    array.resize(result, _ar_size)
-    cdef int* result_ptr = result.data.as_ints
+    # first index. A numpy array can be handed to numpy functions
+    # (e.g. for indexing) without copying.
+    cdef int _ar_size = ar_size or (max(_stop - _start, 0) + 1)
+    cdef numpy.ndarray result = numpy.empty(_ar_size, dtype=numpy.int32)
+    cdef int* result_ptr = <int*>numpy.PyArray_DATA(result)
+
+    cdef const FilterData* cdata = NULL
+    cdef int cdata_count = 0
+    if filters is not None:
+        cdata = filters.cdata
+        cdata_count = filters.count
+
+    cdef bool overflow = False
+    with nogil:
+        while params.irow < _stop and has_more_lines(&params):
+            # Match all filters against the current line
+            if _cmp_cfilters(params.line, cdata, cdata_count):
+                if params.count >= _ar_size:
+                    overflow = True
+                    break
+
+                # All filters matched (returned True)
+                # Append the current line-no
+                result_ptr[params.count] = params.irow
+                params.count += 1
+
+            next_line(&params)
+
+    assert not overflow, f"Array index out-of-bounds: {_ar_size}"
 
-    while has_more_lines(&params):
-        # Match all filters against the current line
-        if _cmp_filters(params.line, filters):
-            assert params.count < _ar_size, f"Array index out-of-bounds: {_ar_size}"
+    # Shrink the array to the actually needed size
+    result.resize(params.count)
+    return result
 
-            # All filters matched (returned True)
-            # Append the current line-no
-            result_ptr[params.count] = params.irow
-            params.count += 1
 
-        next_line(&params)
+# Multi-threaded scans are not worth it for small files (lines per thread)
+PARALLEL_MIN_LINES = 100_000
 
-    # Shrink the array to the actually needed size
-    array.resize(result, params.count)
-    return result
+def _line_numbers_parallel(fwf, filters: FWFFilters, ar_size: int, start: int, stop: None|int, threads: int):
+    """Split the lines into one chunk per thread, scan them in parallel and
+    concatenate the results"""
+
+    start = max(start, 0)
+    stop = fwf.line_count if stop is None else min(stop, fwf.line_count)
+
+    chunk = max(-(-(stop - start) // threads), PARALLEL_MIN_LINES)
+    if chunk >= stop - start:
+        return line_numbers(fwf, filters, ar_size, start=start, stop=stop)
+
+    # The workers read the memory without the GIL. Each of them pins the
+    # buffer (see line_numbers()), and so do we until all of them are done.
+    cdef const unsigned char[:] buffer = _pin_buffer(fwf)
+
+    with ThreadPoolExecutor(threads) as executor:
+        rtn = executor.map(
+            lambda i: line_numbers(fwf, filters, ar_size, start=i, stop=min(i + chunk, stop)),
+            range(start, stop, chunk))
+
+        rtn = numpy.concatenate(list(rtn))
+
+    assert not ar_size or len(rtn) <= ar_size, f"Array index out-of-bounds: {ar_size}"
+    return rtn
 
 # -----------------------------------------------------------------------------
 # -----------------------------------------------------------------------------
@@ -393,15 +632,24 @@ def field_data(fwf, index_field: str, int_value: bool = False, filters: FWFFilte
     cdef dtype = f"S{params.index_field_size}" if int_value == False else numpy.int32
     cdef numpy.ndarray values = numpy.empty(fwf.line_count, dtype=dtype)
     cdef bool convert_to_int = int_value
+    cdef int ar_size = fwf.line_count
+
+    # Write straight into the array's memory, rather then creating a
+    # python bytes object for every line.
+    cdef char* values_ptr = <char*>numpy.PyArray_DATA(values)
+    cdef int* values_int_ptr = <int*>values_ptr
 
     # Loop over every line
     while has_more_lines(&params):
         if _cmp_filters(params.line, filters):
+            assert params.count < ar_size, f"Array index out-of-bounds: {ar_size}"
+
             # Add the field value to the numpy array
             if convert_to_int:
-                values[params.count] = _field_data_int(&params)
+                values_int_ptr[params.count] = _field_data_int(&params)
             else:
-                values[params.count] = _field_data(&params)
+                _copy_field(values_ptr + params.count * params.index_field_size,
+                    params.line + params.index_startpos, params.index_field_size)
 
             params.count += 1
 
@@ -414,6 +662,60 @@ def field_data(fwf, index_field: str, int_value: bool = False, filters: FWFFilte
 # -----------------------------------------------------------------------------
 # -----------------------------------------------------------------------------
 
+cdef enum IndexMode:
+    INDEX_SETITEM = 0       # Use index_dict[key] = lineno
+    INDEX_DICT = 1          # Plain dict: data[key] = lineno
+    INDEX_FWFDICT = 2       # FWFDict: data[key].append(lineno)
+    INDEX_FIXED_BYTES = 3   # FixedBytesDictWithIntListValues: add the raw field data (no bytes object)
+
+
+cdef int _index_mode(index_dict, int key_size=0):
+    """Most indexes simply store the values in a plain dict (unique) or a
+    FWFDict (none-unique). Then we can update the dict directly, and avoid
+    the python method calls for every line.
+
+    'key_size' is the number of bytes of the raw key, or 0 if the key is
+    not the raw field data (e.g. converted to int)
+    """
+
+    if type(index_dict).__setitem__ is not FWFIndexLike.__setitem__:
+        return INDEX_SETITEM
+
+    data = index_dict.data
+    if type(data) is dict:
+        return INDEX_DICT
+
+    if type(data) is FWFDict:
+        return INDEX_FWFDICT
+
+    if (type(data) is FixedBytesDictWithIntListValues) and (key_size > 0):
+        if (<FixedBytesDictWithIntListValues>data).keylen == key_size:
+            return INDEX_FIXED_BYTES
+
+    return INDEX_SETITEM
+
+# -----------------------------------------------------------------------------
+# -----------------------------------------------------------------------------
+
+cdef inline _index_add(int mode, index_dict, data, key, int irow):
+    """Add 'irow' to the index. See _index_mode()"""
+
+    cdef PyObject* values
+
+    if mode == INDEX_DICT:
+        PyDict_SetItem(data, key, irow)
+    elif mode == INDEX_FWFDICT:
+        values = PyDict_GetItem(data, key)
+        if values == NULL:
+            PyDict_SetItem(data, key, [irow])
+        else:
+            PyList_Append(<object>values, irow)
+    else:
+        index_dict[key] = irow
+
+# -----------------------------------------------------------------------------
+# -----------------------------------------------------------------------------
+
 def create_index(fwf,
     index_field: str,
     index_dict: FWFIndexLike,
@@ -456,18 +758,73 @@ def create_index(fwf,
         else:
             raise ValueError("create_index(): Currently on 'int' is supported for 'func'")
 
+    cdef int key_size = 0 if (has_func or create_int_index) else params.index_field_size
+    cdef int mode = _index_mode(index_dict, key_size)
+    cdef data = index_dict.data
+    cdef FixedBytesDictWithIntListValues fixed_dict = data if mode == INDEX_FIXED_BYTES else None
+
     while has_more_lines(&params):
         if _cmp_filters(params.line, filters):
             # Add the value and row to the index
-            if create_int_index:
-                key = _field_data_int(&params)
+            if mode == INDEX_FIXED_BYTES:
+                # Straight from the file into the dict, no bytes object
+                fixed_dict.put_raw(<const unsigned char*>(params.line + params.index_startpos), params.irow)
+            else:
+                if create_int_index:
+                    key = _field_data_int(&params)
+                else:
+                    key = _field_data(&params)
+                    if has_func:
+                        key = cfunc(bytes(key))
+
+                # Note: FWFIndexLike will do an append(), if the key is missing
+                # (and the index is none-unique)
+                _index_add(mode, index_dict, data, key, params.irow)
+
+        next_line(&params)
+
+# -----------------------------------------------------------------------------
+# -----------------------------------------------------------------------------
+
+def field_data_and_index(fwf,
+    index_field: str,
+    index_dict: FWFIndexLike,
+    offset: int = 0,
+    filters: FWFFilters = None):
+    """Same as field_data() and create_index() combined, but reading the
+    (large) file only once, e.g. when the index is needed as well as the field
+    data for some numpy based processing.
+
+    'index_dict' will be updated with the (raw bytes) keys, and the numpy array
+    with the field data is returned.
+    """
+
+    cdef InternalData params = _init_internal_data(fwf, index_field, offset)
+
+    cdef numpy.ndarray values = numpy.empty(fwf.line_count, dtype=f"S{params.index_field_size}")
+    cdef int ar_size = fwf.line_count
+    cdef char* values_ptr = <char*>numpy.PyArray_DATA(values)
+
+    cdef int mode = _index_mode(index_dict, params.index_field_size)
+    cdef data = index_dict.data
+    cdef FixedBytesDictWithIntListValues fixed_dict = data if mode == INDEX_FIXED_BYTES else None
+
+    while has_more_lines(&params):
+        if _cmp_filters(params.line, filters):
+            assert params.count < ar_size, f"Array index out-of-bounds: {ar_size}"
+
+            _copy_field(values_ptr + params.count * params.index_field_size,
+                params.line + params.index_startpos, params.index_field_size)
+
+            if mode == INDEX_FIXED_BYTES:
+                fixed_dict.put_raw(<const unsigned char*>(params.line + params.index_startpos), params.irow)
             else:
                 key = _field_data(&params)
-                if has_func:
-                    key = cfunc(bytes(key))
+                _index_add(mode, index_dict, data, key, params.irow)
 
-            # Note: FWFIndexLike will do an append(), if the key is missing
-            # (and the index is none-unique)
-            index_dict[key] = params.irow
+            params.count += 1
 
         next_line(&params)
+
+    values.resize(params.count)
+    return values
@@ -0,0 +1,22 @@
+# encoding: utf-8
+
+cdef class FixedBytesDictWithIntListValues:
+
+    cdef readonly int keylen
+    cdef readonly int capacity          # Number of slots in the hash table (power of 2)
+    cdef readonly int size              # Number of keys
+    cdef readonly int last              # The last position used in 'data' and 'next'
+    cdef readonly bint finalized
+
+    cdef unsigned char[::1] _keys       # 'capacity' keys with 'keylen' bytes each
+    cdef int[::1] _slots                # The start-pos per slot or 0 for empty slots
+    cdef int[::1] _data                 # The lineno
+    cdef int[::1] _next                 # The position of the next entry or 0 for end-of-list
+
+    cdef readonly object data
+    cdef readonly object next
+
+    cdef int _find_slot(self, const unsigned char* key)
+    cdef _grow(self)
+    cdef int _lookup(self, key)
+    cdef int put_raw(self, const unsigned char* key, int lineno) except -1
@@ -7,6 +7,9 @@ import collections.abc
 import struct
 import numpy as np
 
+from libc.string cimport memcmp, memcpy
+from libc.stdint cimport uint64_t
+
 
 # TODO Not yet support by Cython (0.29.32)
 # class BytesDictWithIntListValues(collections.abc.Mapping[Any, list[int]]):  # pylint: disable=missing-class-docstring)
@@ -58,15 +61,14 @@ class BytesDictWithIntListValues(collections.abc.Mapping):  # pylint: disable=mi
 
         maxsize += 1  # We are not using the '0' entry. 0 means end-of-list.
 
-        # Linked list: 3 values per entry: lineno, next_pos, and end_pos
+        # Linked list with 2 values per entry: lineno and next_pos. New entries
+        # are prepended, hence the dict always points at the most recently
+        # added entry, and no extra array with the end-of-list positions is
+        # needed. get() restores the insertion order.
         self.data = np.zeros(maxsize, dtype=np.int32)
 
         self.next = np.zeros(maxsize, dtype=np.int32)
 
-        # end_pos points at the last element in the list to perf optimize appends.
-        # finish() will delete these data and free up memory no longer needed.
-        self.endpos = np.zeros(maxsize, dtype=np.int32)
-
         # The position in the arrays where to add the next values
         self.last: int = 0
 
@@ -77,12 +79,15 @@ class BytesDictWithIntListValues(collections.abc.Mapping):  # pylint: disable=mi
         """Once all all data have been added to the dict, it is possible to
         optimize the memory layout for faster access and reduce memory
         consumption.
+
+        The arrays are shrunk to the number of entries actually added, e.g. if
+        only a subset of the lines (filter) has been indexed.
         """
 
         if self.finalized == False:
             self.finalized = True
-
-        self.endpos = None
+            self.data = self.data[:self.last + 1].copy()
+            self.next = self.next[:self.last + 1].copy()
 
 
     def __getitem__(self, key) -> Sequence: # list[int]:
@@ -103,13 +108,9 @@ class BytesDictWithIntListValues(collections.abc.Mapping):  # pylint: disable=mi
         assert self.finalized == False
 
         self.last += 1
-        inext = self.index.setdefault(key, self.last)
-        if inext != self.last:
-            value = inext
-            inext = self.endpos[inext] or inext
-            self.next[inext] = inext = self.last
-            self.endpos[value] = inext
-
+        inext = self.last
+        self.next[inext] = self.index.get(key, 0)
+        self.index[key] = inext
         self.data[inext] = lineno
 
 
@@ -163,6 +164,7 @@ class BytesDictWithIntListValues(collections.abc.Mapping):  # pylint: disable=mi
 
             inext = self.next[inext]
 
+        rtn.reverse()
         return rtn
 
 
@@ -182,4 +184,245 @@ class BytesDictWithIntListValues(collections.abc.Mapping):  # pylint: disable=mi
         from the mem optimized index: performance is worse and memory
         is wasted. For unique indices prefer a plan python dict.
         """
-        return np.count_nonzero(self.data) == 0
+        return np.count_nonzero(self.next) == 0
+
+
+# -----------------------------------------------------------------------------
+# -----------------------------------------------------------------------------
+
+cdef inline uint64_t _hash_key(const unsigned char* key, int keylen):
+    """FNV-1a hash of the key bytes"""
+
+    cdef uint64_t rtn = 14695981039346656037ULL
+    cdef int i
+    for i in range(keylen):
+        rtn ^= key[i]
+        rtn *= 1099511628211ULL
+
+    return rtn
+
+
+cdef class FixedBytesDictWithIntListValues:
+    """Same as BytesDictWithIntListValues, but the dict is replaced as well.
+
+    Index keys are fixed-width fields, e.g. an ID with 10 bytes. Rather then a
+    python dict with millions of (small) bytes objects as keys, the keys are
+    copied into one array of bytes (keylen bytes per slot). A simple hash table
+    (open addressing, linear probing) maps the keys to the start of the
+    list of linenos, e.g. 'slots[hash(key)] = start-pos'. The table is grown
+    (2x) whenever it is half full.
+
+    Only bytes keys with exactly 'keylen' bytes are supported.
+    """
+
+    # The attributes and cdef methods are declared in the .pxd file, so that
+    # other Cython modules (fwf_db_cython) can add entries without python calls.
+
+
+    def __init__(self, maxsize: int, keylen: int, capacity: int = 1024):
+        """Create the dict.
+
+        Maxsize does not refer to the number of keys, but to the overall number
+        of records (lines in file). 'capacity' is the initial size of the hash
+        table.
+        """
+
+        assert keylen > 0
+
+        self.keylen = keylen
+        self.size = 0
+        self.last = 0
+        self.finalized = False
+
+        self.capacity = 16
+        while self.capacity < capacity:
+            self.capacity *= 2
+
+        self._keys = np.zeros(self.capacity * keylen, dtype=np.uint8)
+        self._slots = np.zeros(self.capacity, dtype=np.int32)
+
+        # The '0' entry is not used. 0 means end-of-list.
+        self.data = np.zeros(maxsize + 1, dtype=np.int32)
+        self.next = np.zeros(maxsize + 1, dtype=np.int32)
+        self._data = self.data
+        self._next = self.next
+
+
+    cdef int _find_slot(self, const unsigned char* key):
+        """The slot with the key, or the empty slot where to add the key"""
+
+        cdef int mask = self.capacity - 1
+        cdef int i = <int>(_hash_key(key, self.keylen) & mask)
+        while self._slots[i] != 0:
+            if memcmp(&self._keys[i * self.keylen], key, self.keylen) == 0:
+                return i
+
+            i = (i + 1) & mask
+
+        return i
+
+
+    cdef _grow(self):
+        """Double the capacity and re-insert all keys"""
+
+        cdef unsigned char[::1] old_keys = self._keys
+        cdef int[::1] old_slots = self._slots
+        cdef int old_capacity = self.capacity
+        cdef int i, j
+
+        self.capacity *= 2
+        self._keys = np.zeros(self.capacity * self.keylen, dtype=np.uint8)
+        self._slots = np.zeros(self.capacity, dtype=np.int32)
+
+        for i in range(old_capacity):
+            if old_slots[i] != 0:
+                j = self._find_slot(&old_keys[i * self.keylen])
+                memcpy(&self._keys[j * self.keylen], &old_keys[i * self.keylen], self.keylen)
+                self._slots[j] = old_slots[i]
+
+
+    cdef int _lookup(self, key):
+        """The start-pos of the key's list, or 0 if the key does not exist.
+
+        'key' is either bytes, or a (contiguous) memoryview, e.g. the field
+        data straight from the file, without creating a bytes object.
+        """
+
+        cdef const unsigned char* ckey
+        cdef const unsigned char[::1] view
+
+        if isinstance(key, bytes):
+            if len(key) != self.keylen:
+                return 0
+
+            ckey = key
+            return self._slots[self._find_slot(ckey)]
+
+        if isinstance(key, memoryview) and key.nbytes == self.keylen and key.c_contiguous:
+            view = key.cast("B")
+            return self._slots[self._find_slot(&view[0])]
+
+        return 0
+
+
+    cdef int put_raw(self, const unsigned char* key, int lineno) except -1:
+        """Add 'lineno' to the list of 'key' (keylen bytes), e.g. straight
+        from the file's memory, without creating a bytes object"""
+
+        if self.finalized:
+            raise AssertionError("The dict has been finalized")
+
+        if self.last + 1 >= self._data.shape[0]:
+            raise IndexError(f"Max size exceeded: {self._data.shape[0] - 1}")
+
+        if (self.size + 1) * 2 > self.capacity:
+            self._grow()
+
+        cdef int i = self._find_slot(key)
+        if self._slots[i] == 0:
+            memcpy(&self._keys[i * self.keylen], key, self.keylen)
+            self.size += 1
+
+        # Like BytesDictWithIntListValues: new entries are prepended
+        self.last += 1
+        self._next[self.last] = self._slots[i]
+        self._slots[i] = self.last
+        self._data[self.last] = lineno
+        return 0
+
+
+    def __setitem__(self, key, lineno: int) -> None:
+        """'key' is either bytes or a (contiguous) memoryview"""
+
+        cdef const unsigned char[::1] view
+
+        if isinstance(key, memoryview):
+            view = key.cast("B")
+            if view.shape[0] != self.keylen:
+                raise ValueError(f"Key must have {self.keylen} bytes: {bytes(view)!r}")
+
+            self.put_raw(&view[0], lineno)
+            return
+
+        if not isinstance(key, bytes):
+            raise TypeError(f"Key must be bytes or memoryview: {key!r}")
+
+        if len(key) != self.keylen:
+            raise ValueError(f"Key must have {self.keylen} bytes: {key!r}")
+
+        self.put_raw(key, lineno)
+
+
+    def finish(self):
+        """Shrink 'data' and 'next' to the number of entries actually added"""
+
+        if self.finalized == False:
+            self.finalized = True
+            self.data = self.data[:self.last + 1].copy()
+            self.next = self.next[:self.last + 1].copy()
+            self._data = self.data
+            self._next = self.next
+
+
+    def get(self, key, default=None) -> None | Sequence: # list[int]:
+        """Get the list of linenos associated with the key, or 'default'"""
+
+        cdef int inext = self._lookup(key)
+        if inext == 0:
+            return default
+
+        rtn: list[int] = []
+        while inext > 0:
+            rtn.append(self._data[inext])
+            inext = self._next[inext]
+
+        rtn.reverse()
+        return rtn
+
+
+    def __getitem__(self, key) -> Sequence: # list[int]:
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        raise KeyError(f"Key not found: {key}")
+
+
+    def __contains__(self, key) -> bool:
+        return self._lookup(key) != 0
+
+
+    def __len__(self) -> int:
+        """The number of keys in the dict"""
+        return self.size
+
+
+    def __iter__(self) -> Iterator:
+        """Iterate over all keys in the dict."""
+        return self.keys()
+
+
+    def keys(self) -> Iterator:
+        cdef int i
+        for i in range(self.capacity):
+            if self._slots[i] != 0:
+                yield bytes(self._keys[i * self.keylen : (i + 1) * self.keylen])
+
+
+    def items(self) -> Iterator: # Iterator[tuple[Any, list[int]]]:
+        for k in self.keys():
+            yield k, self[k]
+
+
+    def values(self) -> Iterator: # Iterator[list[int]]:
+        for k in self.keys():
+            yield self[k]
+
+
+    def is_unique(self) -> bool:
+        """Determine if all index entries refer to only 1 line.
+        See BytesDictWithIntListValues.is_unique()"""
+        return np.count_nonzero(self.next[:self.last + 1]) == 0
+
+
+collections.abc.Mapping.register(FixedBytesDictWithIntListValues)
@@ -14,7 +14,8 @@ from .fwf_file import FWFFile
 from .fwf_multi_file import FWFMultiFile
 from .fwf_index_builder_cython import FWFCythonIndexBuilder
 from .fwf_index_like import FWFIndexDict, FWFUniqueIndexDict
-from .fwf_operator import FWFOperator
+from .fwf_index_sorted import FWFSortedIndex, FWFSortedIndexBuilder
+from .fwf_operator import FWFOperator, FWFOperatorFilter
 from .fwf_pandas import to_pandas
 from .fwf_open import fwf_open
 
@@ -5,6 +5,7 @@
 
 import mmap
 from typing import Iterator
+import numpy as np
 
 from .fwf_fieldspecs import FWFFileFieldSpecs
 from .fwf_view_like import FWFViewLike
@@ -57,6 +58,9 @@ class FWFFile(FWFViewLike):
         self._fd = None         # open file handle
         self._mm: memoryview|None = None   # memory map (read-only)
 
+        # Contiguous copies of the data of a few (frequently used) fields
+        self._columns: dict[str, np.ndarray] = {}
+
         # This is only to be consistent with FWFMultiFile and thus avoid
         # false-positiv pylint warnings
         self.files = [self.file]
@@ -190,12 +194,13 @@ class FWFFile(FWFViewLike):
             self.file = file
             _fd = self._fd = open(file, "rb")
             _mm = mmap.mmap(_fd.fileno(), 0, access=mmap.ACCESS_READ)
-        elif isinstance(file, bytes):
+        elif isinstance(file, (bytes, memoryview)):
             # Support data already loaded in whatever way. Nice for testing.
+            # Memoryviews allow to share (slices of) one buffer without copying.
             self.file = id(file)
             _mm = file
         else:
-            raise FWFFileException(f"Invalid 'file' argument. Must be of type str or bytes: {type(file)}")
+            raise FWFFileException(f"Invalid 'file' argument. Must be of type str, bytes or memoryview: {type(file)}")
 
         self._mm = memoryview(_mm)
         self.initialize()
@@ -215,6 +220,45 @@ class FWFFile(FWFViewLike):
         self.line_count = self.calculate_line_count(self._mm)
 
 
+    def madvise(self, option: int, start: int = 0, stop: int|None = None) -> 'FWFFile':
+        """Advise the OS how the memory map will be accessed, e.g.
+        mmap.MADV_SEQUENTIAL before scanning all lines, or mmap.MADV_RANDOM
+        before many index lookups. This is only a hint, and silently ignored
+        for data in memory (bytes) or if not supported by the OS (e.g. Windows).
+
+        'start' and 'stop' (line indexes) limit the advice to these lines, e.g.
+        mmap.MADV_WILLNEED to pre-fetch the next block of lines. Like with
+        slices, negative values count from the end.
+        """
+
+        _mm = self._mm.obj if self._mm is not None else None
+        if isinstance(_mm, mmap.mmap) and hasattr(_mm, "madvise"):
+            start, stop, _ = slice(start, stop).indices(self.line_count)
+            if start >= stop:
+                return self
+
+            # The OS requires the start position to be page aligned
+            pos = self.start_pos + start * self.fwidth
+            end = self.start_pos + stop * self.fwidth
+            pos -= pos % mmap.PAGESIZE
+            _mm.madvise(option, pos, min(end, len(_mm)) - pos)
+
+        return self
+
+
+    def prefetch(self, start: int = 0, stop: int|None = None) -> 'FWFFile':
+        """Ask the OS to read the lines 'start' to 'stop' (exclusive) into
+        memory ahead of time, e.g. before scanning the file.
+        Same as madvise(mmap.MADV_WILLNEED), if supported by the OS.
+        """
+
+        option = getattr(mmap, "MADV_WILLNEED", None)
+        if option is not None:
+            self.madvise(option, start, stop)
+
+        return self
+
+
     def close(self) -> None:
         """Close the file and all open handles"""
 
@@ -228,6 +272,7 @@ class FWFFile(FWFViewLike):
             self._fd.close()
 
         self._mm = self._fd = None
+        self._columns = {}
 
 
     def count(self) -> int:
@@ -289,6 +334,48 @@ class FWFFile(FWFViewLike):
             irow += 1
 
 
+    def field_view(self, field: str, lines: None|slice|np.ndarray = None) -> np.ndarray:
+        """A zero-copy numpy array (dtype 'S<len>') over the field's data of all
+        lines in the file.
+
+        The array references the memory (map) of the file. Release the array
+        before closing the file. If the field has been materialized (see
+        materialize_columns()), the contiguous copy is returned instead.
+        With 'lines' (slice or line numbers), only these lines are returned;
+        a copy, unless a slice.
+        """
+        assert self._mm is not None
+
+        rtn = self._columns.get(field)
+        if rtn is None:
+            fspec = self.fields[field]
+            dtype = f"S{fspec.stop - fspec.start}"
+            if self.line_count <= 0:
+                rtn = np.empty(0, dtype=dtype)
+            else:
+                offset = self.start_pos + fspec.start
+                rtn = np.ndarray((self.line_count,), dtype=dtype, buffer=self._mm, offset=offset, strides=(self.fwidth,))
+
+        return rtn if lines is None else rtn[lines]
+
+
+    def materialize_columns(self, *fields: str) -> 'FWFFile':
+        """Copy the data of the fields into contiguous numpy arrays (columns).
+
+        Filters usually access only few narrow fields, e.g. VALID_FROM and
+        VALID_UNTIL. Reading them from the (large) file means reading all of
+        it, every time. Once materialized, field_view() and hence the
+        (vectorized) filters only read the much smaller columns. The columns
+        are dropped when the file is closed.
+        """
+
+        for field in fields:
+            if field not in self._columns:
+                self._columns[field] = np.ascontiguousarray(self.field_view(field))
+
+        return self
+
+
     def iter_lines_with_field(self, field) -> Iterator[memoryview]:
         """An optimized version that iterates over a single field in all lines.
         This is useful for unique and index.
@@ -7,7 +7,9 @@ to speed up index creation."""
 from typing import Callable
 
 from .._cython import fwf_db_cython
-from .fwf_index_like import FWFIndexLike
+from .._cython import FixedBytesDictWithIntListValues
+from .fwf_dict import FWFDict
+from .fwf_index_like import FWFIndexLike, FWFIndexDict
 from .fwf_file import FWFFile
 from .fwf_multi_file import FWFMultiFile
 
@@ -19,23 +21,55 @@ class FWFCythonIndexBuilder:
     Depending on the 'unique' argument, either a unique or none-unique
     index will be created. None-unique indexes are using lists to hold
     multiple values.
+
+    With 'fixed_bytes=True', a none-unique FWFIndexDict on the raw field
+    data (no 'func') is created with a FixedBytesDictWithIntListValues,
+    rather then its (empty) FWFDict. The Cython code adds the field data
+    straight from the file, without a bytes object and a list per key.
+    Alternatively provide a FWFIndexDict with a FixedBytesDictWithIntListValues.
     """
 
-    def __init__(self, data: FWFIndexLike):
+    def __init__(self, data: FWFIndexLike, fixed_bytes: bool = False):
         self.data = data
+        self.fixed_bytes = fixed_bytes
+
 
+    def index(self, fwfview: FWFFile|FWFMultiFile, field: int|str, func: None|Callable=None,
+        filters: None|fwf_db_cython.FWFFilters=None):
+        """Create the index
 
-    def index(self, fwfview: FWFFile|FWFMultiFile, field: int|str, func: None|Callable=None):
-        """Create the index"""
+        Only the lines matching the (optional) 'filters' are added to the
+        index. Filter and index are applied in the same pass over the file.
+        """
 
         field = fwfview.field_from_index(field)
 
+        fixed_dict = None
+        if self.fixed_bytes and func is None and isinstance(fwfview, (FWFFile, FWFMultiFile)):
+            fixed_dict = self._use_fixed_bytes_dict(fwfview, field)
+
         if isinstance(fwfview, FWFFile):
-            fwf_db_cython.create_index(fwfview, field, self.data, func=func)
+            fwf_db_cython.create_index(fwfview, field, self.data, filters=filters, func=func)
         elif isinstance(fwfview, FWFMultiFile):
             offset = 0
             for file in fwfview.files:
-                fwf_db_cython.create_index(file, field, self.data, offset, func=func)
+                fwf_db_cython.create_index(file, field, self.data, offset, filters=filters, func=func)
                 offset += file.line_count
         else:
             raise TypeError(f"FWFCythonIndex requires either a FWFFile or FWFMultiFile: {type(fwfview)}")
+
+        # Only some lines matched the filters: release the unused memory
+        if fixed_dict is not None and filters is not None:
+            fixed_dict.finish()
+
+
+    def _use_fixed_bytes_dict(self, fwfview: FWFFile|FWFMultiFile,
+        field: str) -> None|FixedBytesDictWithIntListValues:
+        """Replace the empty FWFDict of a FWFIndexDict"""
+
+        index = self.data
+        if type(index) is FWFIndexDict and type(index.data) is FWFDict and not index.data:
+            index.data = FixedBytesDictWithIntListValues(len(fwfview), fwfview.fields[field].len)
+            return index.data
+
+        return None
@@ -24,6 +24,15 @@ class FWFNumpyIndexBuilder(FWFIndexBuilder):
 
     def index(self, fwfview: FWFViewLike, field: int|str, **kwargs):
         kwargs.setdefault("dtype", self.dtype or fwfview.field_dtype(1))
+
+        if kwargs.get("func") is None and kwargs.get("log_progress") is None:
+            # The raw field data of all lines, as (zero-copy) view onto the file.
+            # No need to copy the values line by line into a new array.
+            values = fwfview.field_view(fwfview.field_from_index(field))
+            if values is not None:
+                self.create_index_from_array(values.astype(kwargs["dtype"], copy=False))
+                return
+
         kwargs.setdefault("func", bytes)
 
         super().index(fwfview, field, **kwargs)
@@ -50,6 +59,12 @@ class FWFNumpyIndexBuilder(FWFIndexBuilder):
         for i, value in enumerate(gen):
             values[i] = value
 
+        self.create_index_from_array(values)
+
+
+    def create_index_from_array(self, values: np.ndarray) -> None:
+        """Add all the values (one per line) to the index"""
+
         # I tested all sort of numpy and pandas ways, but nothing was as
         # fast as python generators. Any test needs to consider (a) how
         # long it takes to create the "index" and (b) how long it takes
@@ -10,7 +10,7 @@ from typing import Iterable, Iterator, Any, TypeVar, Generic
 from prettytable import PrettyTable
 
 from .fwf_dict import FWFDict
-from .fwf_view_like import FWFViewLike
+from .fwf_view_like import FWFViewLike, raw_bytes_list
 from .fwf_subset import FWFSubset
 from .fwf_line import FWFLine
 
@@ -45,9 +45,39 @@ class FWFIndexBuilder:
         return self
 
 
-    def index_generator(self, parent: FWFViewLike, field: int|str, **_) -> Iterator[memoryview]:
+    # Lines per chunk, when extracting the field values with numpy
+    CHUNK_LINES = 1 << 16
+
+    # Smaller views are read line by line
+    MIN_CHUNK_LINES = 1 << 10
+
+    def index_generator(self, parent: FWFViewLike, field: int|str, **kwargs) -> Iterator[memoryview|bytes]:
         '''Provide an iterator (e.g generator) which iterates over all relevant records'''
-        return parent.iter_lines_with_field(field)
+
+        # 'func' expects the memoryview of every line, as they are read
+        if kwargs.get("func") is not None:
+            return parent.iter_lines_with_field(field)
+
+        # If available, extract the field values chunk by chunk (numpy, C-level),
+        # rather then slicing the field from each line in python. Except for
+        # small views, and if 'log_progress' wants to see every line as it is
+        # read. Either way the keys are the raw bytes, incl. trailing NUL bytes.
+        if (kwargs.get("log_progress") is None
+            and len(parent) >= self.MIN_CHUNK_LINES
+            and parent.field_view(field, slice(0, 0)) is not None):
+            return self._iter_field_chunks(parent, field)
+
+        return (bytes(x) for x in parent.iter_lines_with_field(field))
+
+
+    def _iter_field_chunks(self, parent: FWFViewLike, field: str) -> Iterator[bytes]:
+        """The field values (bytes) of all lines, extracted chunk by chunk"""
+
+        count = len(parent)
+        for start in range(0, count, self.CHUNK_LINES):
+            values = parent.field_view(field, slice(start, start + self.CHUNK_LINES))
+            assert values is not None
+            yield from raw_bytes_list(values)
 
 
     def create_index_from_generator(self, parent: FWFViewLike, gen: Iterator[memoryview], **kwargs) -> None:
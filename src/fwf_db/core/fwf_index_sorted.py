@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+"""An index based on sorted field data, rather than a dict"""
+
+from typing import Any, Iterable, Iterator
+import numpy as np
+
+from .fwf_index_like import FWFIndexDict, FWFIndexBuilder
+from .fwf_view_like import FWFViewLike
+from .fwf_subset import FWFSubset
+
+
+class FWFSortedIndex(FWFIndexDict):
+    """A read-only index, which keeps the (sorted) field values in a numpy
+    array, and the line numbers in the same order.
+
+    Creating the index is a single (C-level) sort, and no dict with millions
+    of (small) lists must be created. This is a good choice for fields
+    which are unique or nearly so, e.g. an ID. Lookups are binary
+    searches, rather than hash lookups.
+    """
+
+    def __init__(self, parent: FWFViewLike):
+        super().__init__(parent, {})    # The dict is not used
+
+        self.sorted_keys: np.ndarray = np.empty(0, dtype="S1")
+        self.order: np.ndarray = np.empty(0, dtype=np.int64)
+        self._starts: None|np.ndarray = None
+
+
+    def set_sorted(self, sorted_keys: np.ndarray, order: np.ndarray) -> None:
+        """Replace the index data: the sorted keys, and the line numbers in
+        the same order"""
+
+        assert len(sorted_keys) == len(order)
+        self.sorted_keys = sorted_keys
+        self.order = order
+        self._starts = None
+
+
+    def starts(self) -> np.ndarray:
+        """The position of the first entry of each (distinct) key"""
+
+        if self._starts is None:
+            keys = self.sorted_keys
+            if len(keys) == 0:
+                self._starts = np.empty(0, dtype=np.int64)
+            else:
+                self._starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+
+        return self._starts
+
+
+    def count(self) -> int:
+        return len(self.starts())
+
+
+    def keys(self) -> Iterable[Any]:
+        return self.sorted_keys[self.starts()].tolist()
+
+
+    def _range(self, key) -> tuple[int, int]:
+        """The start and end position of 'key' in 'order'. start == end,
+        if the key does not exist, or can not be compared with the keys
+        (e.g. None), same as a dict lookup"""
+        keys = self.sorted_keys
+        try:
+            lo = int(np.searchsorted(keys, key, "left"))
+            if lo >= len(keys) or keys[lo] != key:
+                return lo, lo
+        except (TypeError, ValueError):
+            return 0, 0
+
+        return lo, int(np.searchsorted(keys, key, "right"))
+
+
+    def __getitem__(self, key) -> FWFSubset:
+        lo, hi = self._range(key)
+        if lo == hi:
+            raise KeyError(key)
+
+        # Like all other indexes: a list of line numbers
+        return self.to_T(self.order[lo:hi].tolist())
+
+
+    def __contains__(self, param: Any) -> bool:
+        lo, hi = self._range(param)
+        return lo < hi
+
+
+    def lookup_batch(self, keys) -> tuple[np.ndarray, np.ndarray]:
+        """Lookup many keys at once (vectorized). Return the start and end
+        positions into 'order' for every key. start == end, if the key does
+        not exist.
+        """
+        keys = np.asarray(keys)
+        lo = np.searchsorted(self.sorted_keys, keys, "left")
+        hi = np.searchsorted(self.sorted_keys, keys, "right")
+        return lo, hi
+
+
+    def items(self) -> Iterator[tuple[Any, FWFSubset]]:
+        starts = self.starts()
+        ends = np.r_[starts[1:], len(self.sorted_keys)]
+        for key, start, end in zip(self.sorted_keys[starts].tolist(), starts.tolist(), ends.tolist()):
+            yield key, self.to_T(self.order[start:end].tolist())
+
+
+    def __setitem__(self, key, value: int|list[int]) -> None:
+        raise TypeError(f"{self.__class__.__name__} is read-only. Use FWFSortedIndexBuilder to create it.")
+
+
+class FWFSortedIndexBuilder(FWFIndexBuilder):
+    """Create a FWFSortedIndex by means of a (stable) numpy argsort"""
+
+    def __init__(self, data: FWFSortedIndex):
+        self.data = data
+
+
+    def index(self, parent: FWFViewLike, field: int|str, **kwargs):
+        if kwargs.get("func") is None and kwargs.get("log_progress") is None:
+            values = parent.field_view(parent.field_from_index(field))
+            if values is not None:
+                self.create_index_from_array(values)
+                return self
+
+        return super().index(parent, field, **kwargs)
+
+
+    def create_index_from_generator(self, parent: FWFViewLike, gen: Iterator[memoryview], **kwargs) -> None:
+        values = [bytes(x) if isinstance(x, memoryview) else x for x in gen]
+        self.create_index_from_array(np.array(values, dtype=kwargs.get("dtype")))
+
+
+    def create_index_from_array(self, values: np.ndarray) -> None:
+        """Sort the values (one per line) and keep the line numbers in the same order"""
+
+        # Stable, so that the lines of a key remain in file order
+        order = np.argsort(values, kind="stable")
+        self.data.set_sorted(values[order], order)
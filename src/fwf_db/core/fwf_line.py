@@ -24,6 +24,10 @@ class FWFLine:
     line. Access is similar to dict() with get(), [], keys, in, ...
     """
 
+    # Iterating over a view creates a FWFLine for every line. No per
+    # instance __dict__ makes creating them cheaper.
+    __slots__ = ("parent", "lineno", "line")
+
     # Note: 'int' and 'str' is required because of str() and int()
     def __init__(self, parent: 'FWFViewLike', lineno: 'int', line: memoryview):
         assert parent is not None
@@ -14,6 +14,7 @@ depend on.
 """
 
 from typing import Iterator, Optional
+import numpy as np
 
 from .fwf_fieldspecs import FWFFileFieldSpecs
 from .fwf_view_like import FWFViewLike
@@ -75,6 +76,49 @@ class FWFMultiFile(FWFViewLike):
                 close()
 
 
+    def madvise(self, option: int, start: int = 0, stop: int|None = None) -> 'FWFMultiFile':
+        """Advise the OS how the memory maps of all files will be accessed.
+        'start' and 'stop' are line indexes across all files. See FWFFile.madvise()
+        """
+        for file, file_start, file_stop in self._file_ranges(start, stop):
+            file.madvise(option, file_start, file_stop)
+
+        return self
+
+
+    def prefetch(self, start: int = 0, stop: int|None = None) -> 'FWFMultiFile':
+        """Ask the OS to read the lines 'start' to 'stop' (exclusive) of all
+        files into memory. See FWFFile.prefetch()"""
+        for file, file_start, file_stop in self._file_ranges(start, stop):
+            file.prefetch(file_start, file_stop)
+
+        return self
+
+
+    def _file_ranges(self, start: int, stop: int|None) -> Iterator[tuple[FWFFile, int, int]]:
+        """Map the lines 'start' to 'stop' (exclusive, negative values as
+        with slices) onto the files, and yield the files and their
+        respective (local) lines"""
+
+        start, stop, _ = slice(start, stop).indices(self.line_count)
+        offset = 0
+        for file in self.files:
+            file_start = max(start - offset, 0)
+            file_stop = min(stop - offset, file.line_count)
+            if file_start < file_stop:
+                yield file, file_start, file_stop
+
+            offset += file.line_count
+
+
+    def materialize_columns(self, *fields: str) -> 'FWFMultiFile':
+        """Materialize the fields in all files. See FWFFile.materialize_columns()"""
+        for file in self.files:
+            file.materialize_columns(*fields)
+
+        return self
+
+
     def open_and_add(self, file, encoding=None, newline=None, comments=None) -> FWFFile:
         """Open a file complying to the filespec provided in the
         constructor, and register the file for auto-close"""
@@ -147,6 +191,50 @@ class FWFMultiFile(FWFViewLike):
                 count += 1
 
 
+    def field_view(self, field: str, lines: None|slice|np.ndarray = None) -> np.ndarray:
+        """The field data of all files (or of 'lines' only) copied into one
+        numpy array. Only the lines requested are read from the files.
+        """
+        fspec = self.fields[field]
+        dtype = f"S{fspec.stop - fspec.start}"
+
+        if lines is None:
+            lines = slice(None)
+
+        if isinstance(lines, slice):
+            start, stop, step = lines.indices(self.line_count)
+            if step == 1:
+                # A range of lines: the respective range of each file
+                values = []
+                pos = 0
+                for file in self.files:
+                    flen = len(file)
+                    if start < pos + flen and pos < stop:
+                        values.append(file.field_view(field, slice(max(start - pos, 0), min(stop - pos, flen))))
+                    pos += flen
+
+                return np.concatenate(values) if values else np.empty(0, dtype=dtype)
+
+            lines = np.arange(start, stop, step)
+
+        lines = np.asarray(lines, dtype=np.int64)
+        lines = np.where(lines < 0, lines + self.line_count, lines)
+        if len(lines) and (lines.min() < 0 or lines.max() >= self.line_count):
+            raise IndexError(f"Line numbers out of range: 0 - {self.line_count}")
+
+        # Gather the lines file by file
+        rtn = np.empty(len(lines), dtype=dtype)
+        pos = 0
+        for file in self.files:
+            flen = len(file)
+            sel = (lines >= pos) & (lines < pos + flen)
+            if sel.any():
+                rtn[sel] = file.field_view(field, lines[sel] - pos)
+            pos += flen
+
+        return rtn
+
+
     def root(self, index: int, stop_view: Optional['FWFViewLike'] = None) -> tuple['FWFViewLike', int]:
         if (stop_view is not None) and (self == stop_view):
             return self, index
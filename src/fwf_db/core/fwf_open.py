@@ -8,7 +8,7 @@ from .fwf_file import FWFFile
 from .fwf_multi_file import FWFMultiFile
 
 
-FilesType = Union[str, bytes, Path, list['FilesType']]
+FilesType = Union[str, bytes, memoryview, Path, list['FilesType']]
 
 def fwf_open(filespec, files: FilesType, encoding=None, newline=None, comments=None) -> FWFFile|FWFMultiFile:
     """Open a fwf file (read-only) with the file specification provided"""
@@ -2,12 +2,82 @@
 # encoding: utf-8
 
 import sys
+import operator
 from datetime import datetime
 from typing import Callable, Any
 
+import numpy as np
+
 from .fwf_line import FWFLine
 
 
+# The predicates of the non-comparison filters, e.g. op("state").any([...]).
+# Module level functions, rather then a new closure for every filter.
+def _is_in(value, other) -> bool:
+    return value in other
+
+def _is_not_in(value, other) -> bool:
+    return value not in other
+
+def _startswith(value, other) -> bool:
+    return value.startswith(other)
+
+def _endswith(value, other) -> bool:
+    return value.endswith(other)
+
+def _contains(value, other) -> bool:
+    return other in value
+
+
+# Only these work with numpy arrays as well
+VECTORIZABLE = (operator.eq, operator.ne, operator.lt, operator.le, operator.gt, operator.ge)
+
+
+class FWFOperatorFilter:
+    """The filter returned by the FWFOperator comparison operators, e.g.
+    op("gender") == b"F".
+
+    Like any other filter, it is invoked with a line and returns True or False.
+    Additionally it remembers the field, comparison and value, which allows
+    the views to apply the filter to all lines at once (vectorized with numpy),
+    rather then invoking it line by line.
+    """
+
+    def __init__(self, op: 'FWFOperator', cmp: Callable[[Any, Any], Any], value: Any):
+        self.op = op
+        self.cmp = cmp
+        self.value = value
+
+    def __call__(self, line: FWFLine) -> bool:
+        return self.cmp(self.op.get(line), self.value)
+
+    @property
+    def name(self) -> str:
+        """The name of the field the filter applies to"""
+        return self.op.name
+
+    def is_vectorizable(self) -> bool:
+        """True, if the filter can be applied to a numpy array with the
+        (raw bytes) field data of all lines"""
+        # numpy ignores trailing NUL bytes ('S<len>'), python does not
+        return (self.cmp in VECTORIZABLE and self.op.is_raw() and isinstance(self.value, bytes)
+            and b"\x00" not in self.value)
+
+    def vectorize(self, values: np.ndarray) -> np.ndarray:
+        """Apply the comparison to all field values at once and
+        return a boolean mask"""
+        rtn = self.cmp(values, self.value)
+
+        # numpy ignores trailing NUL bytes. Compare the (few) field values
+        # ending with NUL, like python does, with all their bytes.
+        if len(values) and values.dtype.itemsize:
+            raw = values[:, None].view(np.uint8)
+            for i in np.flatnonzero(raw[:, -1] == 0).tolist():
+                rtn[i] = self.cmp(raw[i].tobytes(), self.value)
+
+        return rtn
+
+
 class FWFOperator:
     """ Easily define filter criteria
 
@@ -21,40 +91,59 @@ class FWFOperator:
         self.name = name
         self.func: Callable[[memoryview], Any] = func if func is not None else lambda x: x
 
+        # As long as 'func' does not modify the raw field data, the
+        # comparisons can be applied vectorized to all lines at once.
+        self._raw_func = self.func if func is None else None
+
+        # Filters are applied to all lines of a view. Resolve the field
+        # (name => getter) only once per view, rather then for every line.
+        self._parent = None
+        self._getter: None|Callable[[FWFLine], Any] = None
+
     def get(self, line: FWFLine) -> Any:
         """ Apply the function to the field's data from within the line """
-        return self.func(line[self.name])
+        if line.parent is not self._parent:
+            self._getter = line.parent.getter_for_field(self.name)
+            self._parent = line.parent
+
+        return self.func(self._getter(line))
+
+    def is_raw(self) -> bool:
+        """True, if the field's raw (bytes) data are compared"""
+        return self.func is self._raw_func
 
     def __eq__(self, other):
-        return lambda line: self.get(line) == other
+        return FWFOperatorFilter(self, operator.eq, other)
 
     def __ne__(self, other):
-        return lambda line: self.get(line) != other
+        return FWFOperatorFilter(self, operator.ne, other)
 
     def __gt__(self, other):
-        return lambda line: self.get(line) > other
+        return FWFOperatorFilter(self, operator.gt, other)
 
     def __lt__(self, other):
-        return lambda line: self.get(line) < other
+        return FWFOperatorFilter(self, operator.lt, other)
 
     def __ge__(self, other):
-        return lambda line: self.get(line) >= other
+        return FWFOperatorFilter(self, operator.ge, other)
 
     def __le__(self, other):
-        return lambda line: self.get(line) <= other
+        return FWFOperatorFilter(self, operator.le, other)
 
     def any(self, other):
         """ Apply the 'in' operator to the field's value """
-        return lambda line: self.get(line) in other
+        return FWFOperatorFilter(self, _is_in, other)
 
     def none(self, other):
         """ Apply the 'not in' operator to the field's value """
-        return lambda line: self.get(line) not in other
+        return FWFOperatorFilter(self, _is_not_in, other)
 
     def bytes(self):
         """Convert the raw data from line into bytes"""
         orig = self.func
         self.func = lambda x: bytes(orig(x))
+        if orig is self._raw_func:
+            self._raw_func = self.func
         return self
 
     def str(self, encoding=None):
@@ -90,15 +179,15 @@ class FWFOperator:
 
     def startswith(self, other):
         """Test whether the field data starts with 'arg'"""
-        return lambda line: self.get(line).startswith(other)
+        return FWFOperatorFilter(self, _startswith, other)
 
     def endswith(self, other):
         """Test whether the field data ends with 'arg'"""
-        return lambda line: self.get(line).endswith(other)
+        return FWFOperatorFilter(self, _endswith, other)
 
     def contains(self, other):
         """Test whether the field data contain 'arg'"""
-        return lambda line: other in self.get(line)
+        return FWFOperatorFilter(self, _contains, other)
 
     def date(self, fmt="%Y%m%d"):
         """ Convert the field's value into date """
@@ -4,6 +4,7 @@
 """Define a view that represents a region of its parent view"""
 
 from typing import Iterator, TYPE_CHECKING
+import numpy as np
 
 from .fwf_view_like import FWFViewLike
 
@@ -54,3 +55,22 @@ class FWFRegion(FWFViewLike):
         assert self.parent is not None
         for i in range(self.start, self.stop):
             yield self.parent.raw_line_at(i)
+
+
+    def field_view(self, field: str, lines: None|slice|np.ndarray = None) -> None|np.ndarray:
+        assert self.parent is not None
+
+        # Only read the lines of the region from the parent
+        if lines is None:
+            rows = slice(self.start, self.stop)
+        elif isinstance(lines, slice):
+            rng = range(self.start, self.stop)[lines]
+            if rng.step > 0:
+                rows = slice(rng.start, rng.stop, rng.step)
+            else:
+                rows = np.arange(rng.start, rng.stop, rng.step)
+        else:
+            rows = np.asarray(lines, dtype=np.int64)
+            rows = np.where(rows < 0, rows + self.count(), rows) + self.start
+
+        return self.parent.field_view(field, rows)
@@ -4,6 +4,7 @@
 """Define a view which is a subset of the parent view"""
 
 from typing import Iterator, TYPE_CHECKING
+import numpy as np
 
 from .fwf_view_like import FWFViewLike
 
@@ -42,6 +43,17 @@ class FWFSubset(FWFViewLike):
             yield self.parent.raw_line_at(idx)
 
 
+    def field_view(self, field: str, lines: None|slice|np.ndarray = None) -> None|np.ndarray:
+        assert self.parent is not None
+
+        # Only read the lines of the subset from the parent
+        rows = np.asarray(self.lines, dtype=np.int64)
+        if lines is not None:
+            rows = rows[lines]
+
+        return self.parent.field_view(field, rows)
+
+
     def _fwf_by_indices(self, indices: list[int]) -> 'FWFSubset':
         return FWFSubset(self, indices)
 
@@ -7,11 +7,24 @@ import abc
 import sys
 from typing import overload, Callable, Iterator, Iterable, Optional
 from collections import OrderedDict
-from itertools import islice
+from itertools import islice, repeat, count
 from prettytable import PrettyTable
+import numpy as np
 
 from .fwf_fieldspecs import FWFFileFieldSpecs
 from .fwf_line import FWFLine
+from .fwf_operator import FWFOperatorFilter
+
+
+def raw_bytes_list(values: np.ndarray) -> list[bytes]:
+    """The raw bytes of every element. Unlike ndarray.tolist(), which
+    strips trailing NUL bytes (dtype 'S'), keep all bytes."""
+    width = values.dtype.itemsize
+    if width == 0:
+        return [b""] * len(values)
+
+    data = np.ascontiguousarray(values).tobytes()
+    return [data[i : i + width] for i in range(0, len(data), width)]
 
 
 class FWFViewLike:
@@ -114,12 +127,28 @@ class FWFViewLike:
         """Initiate a FWFSubset (or similar) object and return it"""
 
 
-    def fwf_by_indices(self, indices: list[int]) -> 'FWFViewLike':
+    def fwf_by_indices(self, indices: list[int]|np.ndarray) -> 'FWFViewLike':
         """Initiate a FWFSubset (or similar) object and return it"""
-        indices = [self.validate_index(i) for i in indices]
+        if isinstance(indices, np.ndarray):
+            indices = self.validate_indices(indices).tolist()
+        else:
+            indices = [self.validate_index(i) for i in indices]
+
         return self._fwf_by_indices(indices)
 
 
+    def validate_indices(self, indices: np.ndarray) -> np.ndarray:
+        """Same as validate_index(), but for all the indices in the (numpy)
+        array at once, e.g. the millions of line numbers returned by a filter"""
+
+        xlen = len(self)
+        indices = np.where(indices < 0, indices + xlen, indices)
+        if len(indices) and (indices.min() < 0 or indices.max() >= xlen):
+            raise IndexError(f"Invalid index: 0 >= index < {xlen}")
+
+        return indices
+
+
     @abc.abstractmethod
     def _fwf_by_slice(self, start: int, stop: int) -> 'FWFViewLike':
         """Initiate a FWFRegion (or similar) object and return it"""
@@ -187,6 +216,8 @@ class FWFViewLike:
             fwf[:]
             fwf[1, 5, 10, -1]
             fwf[True, True, False, True]
+            fwf[np.array([True, True, False, True])]
+            fwf[np.array([1, 5, 10, -1])]
         """
 
         if isinstance(row_idx, int):
@@ -196,6 +227,15 @@ class FWFViewLike:
         if isinstance(row_idx, slice):
             return self.fwf_by_slice(row_idx)
 
+        if isinstance(row_idx, np.ndarray):
+            if row_idx.dtype == np.bool_:
+                # E.g. a mask created from field_view() data
+                return self.fwf_by_indices(np.flatnonzero(row_idx))
+
+            if np.issubdtype(row_idx.dtype, np.integer):
+                # E.g. the line numbers returned by fwf_db_cython.line_numbers()
+                return self.fwf_by_indices(row_idx)
+
         if all(isinstance(x, bool) for x in row_idx):
             # TODO this is rather slow for large indexes
             idx = [i for i, v in enumerate(row_idx) if v is True]
@@ -209,8 +249,8 @@ class FWFViewLike:
 
 
     def __iter__(self) -> Iterator[FWFLine]:
-        for lineno, line in enumerate(self.iter_lines()):
-            yield FWFLine(self, lineno, line)
+        # map() creates the FWFLine objects without a python-level loop
+        return map(FWFLine, repeat(self), count(), self.iter_lines())
 
 
     @abc.abstractmethod
@@ -225,14 +265,75 @@ class FWFViewLike:
         return gen
 
 
+    def field_view(self, field: str, lines: None|slice|np.ndarray = None) -> None|np.ndarray:
+        """A numpy array (dtype 'S<len>') with the field's raw data of all
+        lines in the view, or None if not supported by the view.
+
+        'lines' (a slice or line numbers within the view) restricts the data
+        to these lines. Only these lines are read, e.g. for a small subset
+        of a large (multi-) file.
+        """
+        return None
+
+
+    def filter_mask(self, *args: Callable, is_or: bool=False) -> None|np.ndarray:
+        """Apply the filters to all lines at once (vectorized) and return a
+        boolean numpy array. Return None, if any of the filters or the view
+        does not support it.
+        """
+
+        if not args:
+            return None
+
+        for arg in args:
+            if not isinstance(arg, FWFOperatorFilter) or not arg.is_vectorizable():
+                return None
+
+            if arg.name not in self.fields:
+                return None
+
+        mask = None
+        for arg in args:
+            values = self.field_view(arg.name)
+            if values is None:
+                return None
+
+            if mask is None:
+                mask = arg.vectorize(values)
+                continue
+
+            # Like 'and' and 'or' in python: evaluate the next filter only for
+            # the lines still undecided. If only few remain, it is cheaper to
+            # pick them, rather then to read the field of all lines again.
+            undecided = mask if not is_or else ~mask
+            count = np.count_nonzero(undecided)
+            if count * 4 < len(mask):
+                idx = np.flatnonzero(undecided)
+                mask[idx] = arg.vectorize(values[idx])
+            elif is_or:
+                mask |= arg.vectorize(values)
+            else:
+                mask &= arg.vectorize(values)
+
+        return mask
+
+
     def filter(self, *args: Callable, is_or: bool=False) -> 'FWFViewLike':
         """Apply filters (keep) and return a new view."""
+        mask = self.filter_mask(*args, is_or=is_or)
+        if mask is not None:
+            return self._fwf_by_indices(np.flatnonzero(mask).tolist())
+
         func = any if is_or else all
         return self.filter_by_line(lambda x: func(arg(x) for arg in args))
 
 
     def exclude(self, *args: Callable, is_or: bool=False) -> 'FWFViewLike':
         """Apply filters (remove) and return a new view."""
+        mask = self.filter_mask(*args, is_or=is_or)
+        if mask is not None:
+            return self._fwf_by_indices(np.flatnonzero(~mask).tolist())
+
         func = any if is_or else all
         return self.filter_by_line(lambda x: not func(arg(x) for arg in args))
 
@@ -295,6 +396,16 @@ class FWFViewLike:
 
         assert fields, "You must provide at least one field name"
 
+        # Determine the unique values with numpy, if the (raw) field data
+        # are available for all lines at once.
+        values = [self.field_view(field) if field in self.fields else None for field in fields]
+        if all(x is not None for x in values):
+            # Compare the raw bytes ('V'), as 'S' ignores trailing NUL bytes
+            if len(fields) == 1:
+                return raw_bytes_list(np.unique(values[0].view(f"V{values[0].dtype.itemsize}")))
+
+            return list(set(zip(*(raw_bytes_list(x) for x in values))))
+
         idx_dict: set[bytes|tuple[bytes]] = set()
         for line in self:
             if len(fields) == 1:
@@ -9,8 +9,14 @@ It should not be necessary by user code to use it directly.
 
 # pylint: disable=missing-class-docstring, missing-function-docstring, invalid-name
 
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
 from fwf_db import FWFFile
 from fwf_db import FWFIndexDict, FWFUniqueIndexDict
+from fwf_db import FixedBytesDictWithIntListValues
 from fwf_db._cython import fwf_db_cython
 
 def test_say_hello():
@@ -85,6 +91,7 @@ def exec_line_number(filedef, data, filters=None):
     with fwf.open(data):
         filter_args = init_filters(fwf, filters)
         db = fwf_db_cython.line_numbers(fwf, filters=filter_args)
+        assert isinstance(db, np.ndarray) and db.dtype == np.int32
         return db.tolist()
 
 
@@ -168,11 +175,22 @@ def test_get_int_field_data():
     assert exec_get_int_field_data(TestFile5, b"000abcd\n001abcd\n") == [0, 1]
 
 
-def exec_create_index(filedef, data, func=None):
+def test_str2int():
+    # 8 or more digits are converted 8 digits at a time
+    for value in [b"1234567890", b"0000000001", b"12345678", b"  12345678", b"2147483647",
+        b"-123456789", b"+00000012", b"       7", b"0"]:
+        assert fwf_db_cython.str2int(value, 0, len(value)) == int(value)
+
+    assert fwf_db_cython.str2int(b"xx1234567890xx", 2, 12) == 1234567890
+    assert fwf_db_cython.str2int(b"", 0, 0) == 0
+
+
+def exec_create_index(filedef, data, func=None, filters=None):
     fwf = FWFFile(filedef)
     index = FWFIndexDict(fwf)
     with fwf.open(data):
-        fwf_db_cython.create_index(fwf, "id", index, func=func)
+        filter_args = init_filters(fwf, filters)
+        fwf_db_cython.create_index(fwf, "id", index, filters=filter_args, func=func)
         return index.data
 
 def test_create_index():
@@ -186,6 +204,9 @@ def test_create_index():
     assert not exec_create_index(TestFile4, b"", lambda x: int(x, base=10))
     assert exec_create_index(TestFile4, b"000\n001\n000", lambda x: int(x, base=10)) == {0: [0, 2], 1: [1]}
 
+    assert exec_create_index(TestFile5, b"000abcd\n001bcde\n000cdef", filters=[["text", b"bcde"]]) == {b"001": [1], b"000": [2]}
+    assert exec_create_index(TestFile5, b"000abcd\n001bcde\n000cdef", filters=[["text", None, b"bcde"]]) == {b"000": [0]}
+
 
 def exec_create_unique_index(filedef, data):
     fwf = FWFFile(filedef)
@@ -202,6 +223,48 @@ def test_create_unique_index():
     assert exec_create_unique_index(TestFile4, b"000\n001\n000") == {b"000": 2, b"001": 1}
 
 
+def test_field_data_and_index():
+    fwf = FWFFile(TestFile4)
+    index = FWFIndexDict(fwf)
+    with fwf.open(b"000\n001\n000"):
+        db = fwf_db_cython.field_data_and_index(fwf, "id", index)
+        assert db.tolist() == [b"000", b"001", b"000"]
+        assert index.data == {b"000": [0, 2], b"001": [1]}
+
+        index = FWFUniqueIndexDict(fwf)
+        db = fwf_db_cython.field_data_and_index(fwf, "id", index, offset=10)
+        assert db.tolist() == [b"000", b"001", b"000"]
+        assert index.data == {b"000": 12, b"001": 11}
+
+
+def test_create_index_fixed_bytes_dict():
+    fwf = FWFFile(TestFile5)
+    with fwf.open(b"000abcd\n001bcde\n000cdef"):
+        # The raw field data are added, without creating a bytes object
+        data = FixedBytesDictWithIntListValues(len(fwf), 3)
+        fwf_db_cython.create_index(fwf, "id", FWFIndexDict(fwf, data))
+        assert dict(data.items()) == {b"000": [0, 2], b"001": [1]}
+
+        data = FixedBytesDictWithIntListValues(len(fwf), 3)
+        filter_args = init_filters(fwf, [["text", b"bcde"]])
+        fwf_db_cython.create_index(fwf, "id", FWFIndexDict(fwf, data), filters=filter_args)
+        assert dict(data.items()) == {b"001": [1], b"000": [2]}
+
+        data = FixedBytesDictWithIntListValues(len(fwf), 3)
+        db = fwf_db_cython.field_data_and_index(fwf, "id", FWFIndexDict(fwf, data), offset=10)
+        assert db.tolist() == [b"000", b"001", b"000"]
+        assert dict(data.items()) == {b"000": [10, 12], b"001": [11]}
+
+        # Keys with a different size are rejected
+        data = FixedBytesDictWithIntListValues(len(fwf), 4)
+        with pytest.raises(ValueError):
+            fwf_db_cython.create_index(fwf, "id", FWFIndexDict(fwf, data))
+
+        data = FixedBytesDictWithIntListValues(1, 3)
+        with pytest.raises(IndexError):
+            fwf_db_cython.create_index(fwf, "id", FWFIndexDict(fwf, data))
+
+
 def exec_create_int_index(filedef, data):
     fwf = FWFFile(filedef)
     index = FWFIndexDict(fwf)
@@ -249,6 +312,76 @@ def test_fwf_cython_filter_2():
 
     assert exec_line_number(TestFile6, data, [["ORDER_DATE", b"20170101", b"20180101"], ["MODIFIED", b"2017", b"201702"]]) == [0, 2, 3]
 
+    # Values with 1 byte and more then 8 bytes
+    assert exec_line_number(TestFile6, data, [["ID", b"0", b"1"]]) == [0, 1, 2, 3, 4]
+    assert exec_line_number(TestFile6, data, [["MODIFIED", b"2017010810", b"20171231235959"]]) == [2, 3]
+    assert exec_line_number(TestFile6, data, [["MODIFIED", b"20170108101112", b"20180101000000"]]) == [1, 2, 3]
+
+
+def test_drain():
+    fwf = FWFFile(TestFile4)
+    with fwf.open(b""):
+        assert fwf_db_cython.drain(fwf) == 0
+
+    with fwf.open(b"000\n100\n300"):
+        assert fwf_db_cython.drain(fwf) == ord("0") ^ ord("1") ^ ord("3")
+
+
+def test_line_numbers_chunks():
+    data = b"".join(b"%03d\n" % i for i in range(100))
+    fwf = FWFFile(TestFile4)
+    with fwf.open(data):
+        filter_args = init_filters(fwf, [["id", b"010", b"090"]])
+        expected = fwf_db_cython.line_numbers(fwf, filters=filter_args).tolist()
+        assert expected == list(range(10, 90))
+
+        assert fwf_db_cython.line_numbers(fwf, start=95).tolist() == [95, 96, 97, 98, 99]
+        assert fwf_db_cython.line_numbers(fwf, start=3, stop=5).tolist() == [3, 4]
+        assert fwf_db_cython.line_numbers(fwf, start=50, stop=500).tolist() == list(range(50, 100))
+        assert len(fwf_db_cython.line_numbers(fwf, start=200)) == 0
+
+        # The scan releases the GIL: scan chunks of the file in parallel
+        with ThreadPoolExecutor(4) as executor:
+            chunks = executor.map(lambda i: fwf_db_cython.line_numbers(fwf, filter_args, start=i, stop=i + 30), range(0, 100, 30))
+            assert np.concatenate(list(chunks)).tolist() == expected
+
+        # The same, built-in
+        assert fwf_db_cython.line_numbers(fwf, filter_args, threads=4).tolist() == expected
+
+        with pytest.raises(AssertionError):
+            fwf_db_cython.line_numbers(fwf, ar_size=10)
+
+
+def test_line_numbers_threads(monkeypatch):
+    data = b"".join(b"%03d\n" % i for i in range(100))
+    fwf = FWFFile(TestFile4)
+    with fwf.open(data):
+        filter_args = init_filters(fwf, [["id", b"010", b"090"]])
+        monkeypatch.setattr(fwf_db_cython, "PARALLEL_MIN_LINES", 7)
+
+        for threads in [None, 2, 3, 4, 200]:
+            assert fwf_db_cython.line_numbers(fwf, filter_args, threads=threads).tolist() == list(range(10, 90))
+            assert fwf_db_cython.line_numbers(fwf, threads=threads, start=5, stop=50).tolist() == list(range(5, 50))
+            assert fwf_db_cython.line_numbers(fwf, filter_args, ar_size=80, threads=threads).tolist() == list(range(10, 90))
+            with pytest.raises(AssertionError):
+                fwf_db_cython.line_numbers(fwf, filter_args, ar_size=79, threads=threads)
+
+        for threads in [0, -1]:
+            with pytest.raises(ValueError):
+                fwf_db_cython.line_numbers(fwf, threads=threads)
+
+
+def test_field_data_fixed_sizes():
+    data = b"""# Comment
+01 20170101 20170102172300
+02 20171231 20171231235959
+"""
+    fwf = FWFFile(TestFile6)
+    with fwf.open(data):
+        # 8 bytes, 14 bytes
+        assert fwf_db_cython.field_data(fwf, "ORDER_DATE").tolist() == [b"20170101", b"20171231"]
+        assert fwf_db_cython.field_data(fwf, "MODIFIED").tolist() == [b"20170102172300", b"20171231235959"]
+
 
 class TestFile7:
 
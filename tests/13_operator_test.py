@@ -5,6 +5,7 @@
 
 from fwf_db import FWFFile
 from fwf_db import op
+from fwf_db.core import FWFOperatorFilter
 
 
 DATA = b"""# My comment test
@@ -74,3 +75,82 @@ def test_table_filter_by_line():
 
         birthday_year = op("birthday", lambda x: int(x) / 100 / 100)
         rtn = fwf.filter(birthday_year < 1960)
+
+
+def test_vectorized_filter():
+    fwf = FWFFile(HumanFile)
+    with fwf.open(DATA):
+
+        assert isinstance(op("gender") == b"M", FWFOperatorFilter)
+        assert (op("gender") == b"M").is_vectorizable()
+        assert (op("gender").bytes() <= b"M").is_vectorizable()
+        assert not (op("gender").str() == "M").is_vectorizable()
+        assert not (op("birthday").int() < 19600000).is_vectorizable()
+        assert not (op("birthday", lambda x: x[0:4]) == b"1957").is_vectorizable()
+
+        assert fwf.filter_mask(op("gender").str() == "M") is None
+        assert fwf.filter_mask(op("gender") == b"M").tolist().count(True) == 3
+
+        for args in [[op("gender") == b"M"], [op("birthday") <= b"19800101"],
+                     [op("gender") != b"M", op("state") >= b"MD"],
+                     # Only few lines remain undecided after the first filter
+                     [op("state") == b"AR", op("gender") == b"F", op("birthday") < b"19600101"],
+                     [op("state") != b"AR", op("gender") == b"M"]]:
+
+            rtn = fwf.filter(*args)
+            expected = fwf.filter_by_line(lambda line: all(arg(line) for arg in args))  # pylint: disable=cell-var-from-loop
+            assert rtn.lines == expected.lines
+
+            rtn = fwf.exclude(*args, is_or=True)
+            expected = fwf.filter_by_line(lambda line: not any(arg(line) for arg in args))  # pylint: disable=cell-var-from-loop
+            assert rtn.lines == expected.lines
+
+            rtn = fwf.filter(*args, is_or=True)
+            expected = fwf.filter_by_line(lambda line: any(arg(line) for arg in args))  # pylint: disable=cell-var-from-loop
+            assert rtn.lines == expected.lines
+
+        # Views of views
+        rtn = fwf[2:8].filter(op("gender") == b"M")
+        assert [line.rooted().lineno for line in rtn] == [2, 4]
+
+        rtn = fwf.filter(op("gender") == b"F").filter(op("state") == b"AR")
+        assert [line.rooted().lineno for line in rtn] == [0, 8]
+
+    # numpy ignores trailing NUL bytes, python does not
+    fwf = FWFFile(HumanFile)
+    with fwf.open(DATA.replace(b"AR1957", b"A\x001957", 1)):
+        assert not (op("state") == b"A\x00").is_vectorizable()
+        assert fwf.filter(op("state") == b"A\x00").lines == [0]
+        for arg in [op("state") == b"A", op("state") != b"A", op("state") <= b"A", op("state") > b"A"]:
+            expected = fwf.filter_by_line(arg)
+            assert fwf.filter(arg).lines == expected.lines
+            assert fwf[[0, 8]].filter(arg).lines == fwf[[0, 8]].filter_by_line(arg).lines
+
+
+def test_operator_reused_across_views():
+    fwf = FWFFile(HumanFile)
+    with fwf.open(DATA):
+
+        # The field getter is resolved once per view
+        gender = op("gender").str() == "M"
+        assert len(fwf.filter(gender)) == 3
+        assert [line.rooted().lineno for line in fwf[2:8].filter(gender)] == [2, 4]
+        assert len(fwf.filter(gender)) == 3
+
+
+def test_operator_predicates():
+    fwf = FWFFile(HumanFile)
+    with fwf.open(DATA):
+
+        # Same filter objects as the comparisons, but not vectorizable
+        flt = op("state").any([b"AR", b"MI"])
+        assert isinstance(flt, FWFOperatorFilter)
+        assert flt.name == "state"
+        assert not flt.is_vectorizable()
+        assert (op("state") == b"AR").is_vectorizable()
+
+        assert len(fwf.filter(flt)) == 3
+        assert len(fwf.filter(op("state").none([b"AR", b"MI"]))) == 7
+        assert len(fwf.filter(op("profession").bytes().startswith(b"Medic"))) == 2
+        assert len(fwf.filter(op("profession").bytes().strip().endswith(b"dian"))) == 4
+        assert len(fwf.filter(op("name").str().contains("Kidd"))) == 1
@@ -7,9 +7,11 @@
 # Current version of pylint not yet working well with python type hints and is causing plenty false positiv.
 # pylint: disable=not-an-iterable, unsubscriptable-object
 
+import mmap
 from typing import Iterable
 
 import pytest
+import numpy as np
 
 from fwf_db import FWFFile
 from fwf_db import FWFLine
@@ -392,6 +394,87 @@ def test_view_of_a_view():
             assert rec.rooted().lineno in [5, 6]
 
 
+def test_field_view():
+    with fwf_open(HumanFile, DATA) as fwf:
+        values = fwf.field_view("state")
+        assert len(values) == len(fwf)
+        assert values.dtype == "S2"
+        assert values[0] == b"AR"
+        assert values[-1] == b"ME"
+
+        assert fwf[1:3].field_view("state").tolist() == [b"MI", b"WI"]
+        assert fwf[[0, 9]].field_view("gender").tolist() == [b"F", b"F"]
+
+        rtn = fwf[values == b"AR"]
+        assert [line.rooted().lineno for line in rtn] == [0, 8]
+
+        rtn = fwf[np.flatnonzero(values == b"AR")]
+        assert [line.rooted().lineno for line in rtn] == [0, 8]
+        del values
+
+        assert fwf[np.array([1, -1], dtype=np.int32)].lines == [1, 9]
+        with pytest.raises(IndexError):
+            fwf[np.array([0, 10])]      # pylint: disable=pointless-statement
+
+    with fwf_open(HumanFile, b"# Empty") as fwf:
+        assert len(fwf.field_view("state")) == 0
+
+
+def test_materialize_columns():
+    with fwf_open(HumanFile, DATA) as fwf:
+        view = fwf.field_view("state")
+        assert not view.flags.c_contiguous
+
+        assert fwf.materialize_columns("state", "gender") is fwf
+        values = fwf.field_view("state")
+        assert values.flags.c_contiguous
+        assert values.tolist() == view.tolist()
+        assert fwf[1:3].field_view("state").tolist() == [b"MI", b"WI"]
+        assert len(fwf.filter(op("gender") == b"M")) == 3
+        del view, values
+
+    assert not fwf._columns
+
+    with fwf_open(HumanFile, [DATA, DATA]) as fwf:
+        assert fwf.materialize_columns("state") is fwf
+        assert all(file.field_view("state").flags.c_contiguous for file in fwf.files)
+        assert len(fwf.field_view("state")) == 20
+
+
+def test_madvise():
+    option = getattr(mmap, "MADV_SEQUENTIAL", 2)
+
+    with fwf_open(HumanFile, DATA) as fwf:
+        assert fwf.madvise(option) is fwf
+
+    with fwf_open(HumanFile, "./sample_data/humans.txt") as fwf:
+        assert fwf.madvise(option) is fwf
+        assert len(fwf.filter(op("gender") == b"F")) > 0
+
+        option = getattr(mmap, "MADV_WILLNEED", 3)
+        assert fwf.madvise(option, 10, 20) is fwf
+        assert fwf.madvise(option, len(fwf) - 1, len(fwf) + 100) is fwf
+        assert fwf.madvise(option, len(fwf)) is fwf
+        assert fwf.madvise(option, -10) is fwf
+        assert fwf.madvise(option, -len(fwf) - 100, -5) is fwf
+        assert fwf.prefetch() is fwf
+        assert fwf.prefetch(10, 20) is fwf
+        assert fwf.prefetch(-10) is fwf
+
+    with fwf_open(HumanFile, [DATA, "./sample_data/humans.txt"]) as fwf:
+        assert fwf.madvise(option) is fwf
+        assert fwf.madvise(option, 5, 20) is fwf
+        assert fwf.madvise(option, -10) is fwf
+        assert fwf.prefetch() is fwf
+        assert fwf.prefetch(5, -5) is fwf
+
+        # Line ranges across all files are mapped onto the individual files
+        ranges = [(file_start, file_stop) for _, file_start, file_stop in fwf._file_ranges(5, -5)]
+        assert ranges == [(5, len(fwf.files[0])), (0, len(fwf.files[1]) - 5)]
+        ranges = [(file_start, file_stop) for _, file_start, file_stop in fwf._file_ranges(-5, None)]
+        assert ranges == [(len(fwf.files[1]) - 5, len(fwf.files[1]))]
+
+
 def exec_empty_data(data):
     with fwf_open(HumanFile, data) as fwf:
         assert fwf.count() == len(fwf) == 0
@@ -455,6 +538,10 @@ def test_unique():
             (b'Whatever    ', b'Time traveler')
         ]
 
+        # The same on a subset view
+        x = sorted(fwf.filter_by_line(lambda _: True).unique("state"))
+        assert x == [b'AR', b'MD', b'ME', b'MI', b'NV', b'OK', b'PA', b'VT', b'WI']
+
 
 def test_lineno_line_file():
     with fwf_open(HumanFile, DATA) as fwf:
@@ -8,13 +8,16 @@ import pytest
 import numpy as np
 
 from fwf_db import FWFFile
+from fwf_db import FWFDict
 from fwf_db import FWFSubset
 from fwf_db import FWFLine
 from fwf_db import FWFIndexDict, FWFUniqueIndexDict
+from fwf_db import FWFSortedIndex, FWFSortedIndexBuilder
 from fwf_db.core import FWFSimpleIndexBuilder
 from fwf_db.core import FWFNumpyIndexBuilder
 from fwf_db import FWFCythonIndexBuilder
 from fwf_db import BytesDictWithIntListValues
+from fwf_db import FixedBytesDictWithIntListValues
 
 
 DATA = b"""# My comment test
@@ -206,6 +209,81 @@ def test_simple_index_with_mem_optimized_dict():
         assert len(rtn) == 5
 
 
+def test_index_with_fixed_bytes_dict():
+    fwf = FWFFile(HumanFile)
+    with fwf.open(DATA):
+
+        data = FixedBytesDictWithIntListValues(len(fwf), 2)
+        rtn = FWFIndexDict(fwf, data)
+        FWFCythonIndexBuilder(rtn).index(fwf, "state")
+        assert rtn.count() == len(rtn) == 9
+        data.finish()
+        assert rtn[b"AR"].lines == [0, 8]
+        assert b"XX" not in rtn
+
+        data = FixedBytesDictWithIntListValues(len(fwf), 1)
+        rtn = FWFIndexDict(fwf, data)
+        FWFSimpleIndexBuilder(rtn).index(fwf, "gender")
+        assert len(rtn) == 2
+        assert [x.rooted().lineno for x in rtn[b"M"]] == [1, 2, 4]
+
+
+def test_index_field_chunks(monkeypatch):
+    monkeypatch.setattr(FWFSimpleIndexBuilder, "CHUNK_LINES", 3)
+    monkeypatch.setattr(FWFSimpleIndexBuilder, "MIN_CHUNK_LINES", 1)
+
+    fwf = FWFFile(HumanFile)
+    with fwf.open(DATA):
+        # The field values are read chunk by chunk
+        builder = FWFSimpleIndexBuilder(FWFIndexDict(fwf))
+        gen = builder.index_generator(fwf, "state")
+        assert not isinstance(gen, list)
+        assert list(gen) == [bytes(x) for x in fwf.iter_lines_with_field("state")]
+
+        for view in [fwf, fwf[1:8], fwf[[9, 0, 8]]]:
+            rtn = FWFIndexDict(view)
+            FWFSimpleIndexBuilder(rtn).index(view, "state")
+            expected = {}
+            for i, value in enumerate(view.iter_lines_with_field("state")):
+                expected.setdefault(bytes(value), []).append(i)
+            assert {k: v.lines for k, v in rtn.items()} == expected
+
+        # 'func' gets the memoryview of every line, as before
+        values = []
+        rtn = FWFIndexDict(fwf)
+        FWFSimpleIndexBuilder(rtn).index(fwf, "state", func=lambda x: values.append(x) or bytes(x))
+        assert len(values) == 10
+        assert all(isinstance(x, memoryview) for x in values)
+
+
+def nul_padded_data(count: int) -> bytes:
+    """'count' lines, every 3rd with a NUL-padded 'state' (b"A\\x00")"""
+    lines = DATA.splitlines(keepends=True)[1:]
+    lines = [lines[i % len(lines)] for i in range(count)]
+    lines = [x[:9] + b"A\x00" + x[11:] if i % 3 == 0 else x for i, x in enumerate(lines)]
+    return b"".join(lines)
+
+
+def test_index_nul_bytes_min_chunk_lines():
+    # Views just below and above MIN_CHUNK_LINES must produce the same keys,
+    # incl. trailing NUL bytes
+    keys = {}
+    for count in [FWFSimpleIndexBuilder.MIN_CHUNK_LINES - 1, FWFSimpleIndexBuilder.MIN_CHUNK_LINES]:
+        fwf = FWFFile(HumanFile)
+        with fwf.open(nul_padded_data(count)):
+            for builder in [FWFSimpleIndexBuilder, FWFCythonIndexBuilder]:
+                rtn = FWFIndexDict(fwf)
+                builder(rtn).index(fwf, "state")
+                assert b"A\x00" in rtn
+                assert b"A" not in rtn
+                assert all(type(x) is bytes for x in rtn.keys())
+                assert len(rtn[b"A\x00"]) == (count + 2) // 3
+                keys.setdefault(builder, []).append(set(rtn.keys()))
+
+    for builder, (below, above) in keys.items():
+        assert below == above, builder
+
+
 def test_np_index():
     fwf = FWFFile(HumanFile)
     with fwf.open(DATA):
@@ -266,6 +344,16 @@ def test_cython_index():
         rtn = FWFIndexDict(fwf)
         FWFCythonIndexBuilder(rtn).index(fwf, "state")
         assert rtn.count() == len(rtn) == 9
+        assert isinstance(rtn.data, FWFDict)
+        assert list(rtn.keys())[:3] == [b"AR", b"MI", b"WI"]     # File order
+
+        # Opt-in: fixed size keys without python objects
+        rtn = FWFIndexDict(fwf)
+        FWFCythonIndexBuilder(rtn, fixed_bytes=True).index(fwf, "state")
+        assert rtn.count() == len(rtn) == 9
+        assert isinstance(rtn.data, FixedBytesDictWithIntListValues)
+        assert rtn[b"AR"].lines == [0, 8]
+        assert "AR" not in rtn
 
         rtn = FWFIndexDict(fwf)
         FWFCythonIndexBuilder(rtn).index(fwf, "gender")
@@ -273,6 +361,7 @@ def test_cython_index():
 
         rtn = FWFIndexDict(fwf)
         FWFCythonIndexBuilder(rtn).index(fwf, "state", func=lambda x: x.decode())
+        assert isinstance(rtn.data, FWFDict)
         assert "MI" in rtn
         assert rtn["MI"]
 
@@ -465,3 +554,56 @@ def test_np_unique_index():
         FWFNumpyIndexBuilder(rtn).index(x, "state")
 
 # TODO Add tests that validate that the indexes also work correctly with views (instead of FWFile)
+
+
+def test_sorted_index():
+    fwf = FWFFile(HumanFile)
+    with fwf.open(DATA):
+
+        rtn = FWFSortedIndex(fwf)
+        FWFSortedIndexBuilder(rtn).index(fwf, "state")
+        assert rtn.count() == len(rtn) == 9
+        assert list(rtn.keys()) == sorted(rtn.keys())
+        assert b"AR" in rtn
+        assert b"XX" not in rtn
+        assert rtn[b"AR"].lines == [0, 8]
+        assert rtn.get_string(pretty=False)
+
+        assert isinstance(rtn[b"AR"].lines, list)
+        assert isinstance(next(iter(rtn.items()))[1].lines, list)
+
+        # Keys which can not be compared, are missing, like with a dict
+        for key in [None, "AR", 1]:
+            assert key not in rtn
+            assert rtn.get(key) is None
+            assert rtn.get(key, 0) == 0
+            with pytest.raises(KeyError):
+                _ = rtn[key]
+
+        with pytest.raises(KeyError):
+            _ = rtn[b"XX"]
+
+        with pytest.raises(TypeError):
+            rtn[b"XX"] = 1
+
+        starts, ends = rtn.lookup_batch([b"AR", b"XX", b"MI"])
+        assert (ends - starts).tolist() == [2, 0, 1]
+        assert rtn.order[starts[0]:ends[0]].tolist() == [0, 8]
+
+        # Same result as the dict based index
+        ref = FWFIndexDict(fwf)
+        FWFSimpleIndexBuilder(ref).index(fwf, "state")
+        for key, value in rtn:
+            assert value.lines == ref[key].lines
+
+        rtn = FWFSortedIndex(fwf)
+        FWFSortedIndexBuilder(rtn).index(fwf, "gender", func=lambda x: str(x, "utf-8"))
+        assert len(rtn) == 2
+        assert rtn["M"].lines == [1, 2, 4]
+
+        # Index on a view
+        x = fwf[2:6]
+        rtn = FWFSortedIndex(x)
+        FWFSortedIndexBuilder(rtn).index(x, "gender")
+        assert len(rtn) == 2
+        assert len(rtn[b"F"]) == 2
@@ -9,6 +9,7 @@ from time import time
 import pytest
 
 from fwf_db import BytesDictWithIntListValues
+from fwf_db import FixedBytesDictWithIntListValues
 
 
 def test_constructor():
@@ -46,6 +47,82 @@ def test_get():
     assert data.get("111") == [1, 11]
 
 
+def test_fill_and_finish():
+
+    data = BytesDictWithIntListValues(1000)
+    for i in range(1000):
+        data[i % 100] = i
+
+    assert len(data) == 100
+    assert data.get(7) == list(range(7, 1000, 100))
+
+    data.finish()
+    assert len(data) == 100
+    assert data.get(7) == list(range(7, 1000, 100))
+
+
+def test_is_unique():
+
+    data = BytesDictWithIntListValues(1000)
+    for i in range(10):
+        data[i] = i
+
+    assert data.is_unique()
+
+    data[3] = 10
+    assert not data.is_unique()
+    assert data[3] == [3, 10]
+
+    data.finish()
+    assert len(data.data) == 12
+    assert data[3] == [3, 10]
+
+
+def test_fixed_bytes_dict():
+
+    data = FixedBytesDictWithIntListValues(1000, 3, capacity=4)
+    assert len(data) == 0
+    with pytest.raises(KeyError):
+        data[b"xxx"]    # pylint: disable=pointless-statement
+
+    # Enough keys to grow the hash table a couple of times
+    for i in range(1000):
+        data[b"%03d" % (i % 300)] = i
+
+    assert len(data) == 300
+    assert data.capacity >= 600
+    assert data[b"007"] == [7, 307, 607, 907]
+    assert data.get(b"299") == [299, 599, 899]
+    assert b"299" in data
+    assert b"300" not in data
+    assert "007" not in data            # Only bytes keys
+    assert data.get(b"0077") is None    # Only keys with keylen bytes
+    assert data[memoryview(b"x007x")[1:4]] == [7, 307, 607, 907]
+    assert memoryview(b"299") in data
+    assert memoryview(b"0077") not in data
+    assert memoryview(b"0x0x7")[::2] not in data      # Not contiguous
+    assert sorted(data.keys()) == [b"%03d" % i for i in range(300)]
+    assert not data.is_unique()
+
+    with pytest.raises(TypeError):
+        data["007"] = 1
+
+    with pytest.raises(ValueError):
+        data[b"0077"] = 1
+
+    data.finish()
+    assert len(data.data) == 1001
+    assert len(data) == 300
+    assert data[b"007"] == [7, 307, 607, 907]
+    assert dict(data.items())[b"100"] == [100, 400, 700]
+
+    data = FixedBytesDictWithIntListValues(10, 1)
+    data[b"a"] = 1
+    data[b"b"] = 2
+    assert data.is_unique()
+
+
+@pytest.mark.slow
 def test_large():
 
     data = BytesDictWithIntListValues(int(10e6))
@@ -59,10 +136,12 @@ def test_large():
     assert data["111"] == [1, 11]
     assert data.get("111") == [1, 11]
 
+    # Create the 1 million random keys upfront, so that only the inserts are timed
+    keys = [randrange(int(1e6)) for _ in range(int(1e6))]
+
     # Fill the array with 1 million random numbers
     t1 = time()
-    for i in range(int(1e6)):
-        key = randrange(int(1e6))
+    for i, key in enumerate(keys):
         data[key] = i
 
     print(f'Fill array: Elapsed time is {time() - t1} seconds. Added {len(data):,d} keys')
@@ -4,12 +4,17 @@
 # pylint: disable=missing-class-docstring, missing-function-docstring, invalid-name, missing-module-docstring
 # pylint: disable=protected-access
 
+import pytest
+
+from fwf_db import FWFFile
 from fwf_db import FWFMultiFile
 from fwf_db import op
 from fwf_db import FWFIndexDict, FWFUniqueIndexDict
 from fwf_db.core import FWFSimpleIndexBuilder
 from fwf_db import FWFCythonIndexBuilder
+from fwf_db import FixedBytesDictWithIntListValues
 from fwf_db import fwf_open
+from fwf_db._cython import fwf_db_cython
 
 
 DATA_1 = b"""#
@@ -76,6 +81,15 @@ def test_with_statement():
     assert all(file._mm is None for file in mf.files)
 
 
+def test_shared_buffer():
+    data = memoryview(DATA_1)
+    with fwf_open(DataFile, [data, data[:-33]]) as mf:
+        assert len(mf.files) == 2
+        assert mf.line_count == 19
+        assert mf[0].get_line() == mf[10].get_line()
+        assert mf[18]["ID"] == b"9    "
+
+
 def test_multi_file():
     with fwf_open(DataFile, [DATA_1, DATA_2]) as mf:
         assert isinstance(mf, FWFMultiFile)
@@ -155,42 +169,75 @@ def test_effective_date():
                 assert line in [1, 3, 4, 5]
 
 
-def test_cython_filter():
+def test_field_view():
     with fwf_open(DataFile, [DATA_1, DATA_2]) as mf:
-        assert isinstance(mf, FWFMultiFile)
-        assert len(mf) == 20
-        assert len(mf.files) == 2
-        assert mf.line_count == 20
-
-        for idx, _ in enumerate(mf.iter_lines()):
-            assert idx < 20
-
-        for rec in mf:
-            assert rec.lineno < 20
-
-        for rec in iter(mf[8:12]):
-            assert rec.rooted(mf).lineno >= 8
-            assert rec.rooted(mf).lineno < 12
-
-        for rec in iter(mf[8:12]):        # Note: iter(x) is only to make pylint happy. It actually works without as well.
-            assert rec.rooted(mf).lineno >= 8
-            assert rec.rooted(mf).lineno < 12
-
-        assert mf[0].lineno == 0
-        assert mf[5].lineno == 5
-        assert mf[10].lineno == 10
-        assert mf[15].lineno == 15
-        assert mf[19].lineno == 19
-        assert len(mf[0:5]) == 5
-        assert len(mf[-5:]) == 5
-        assert len(mf[5:15]) == 10
-
-
-def test_cython_index():
+        assert len(mf.field_view("ID")) == 20
+
+        # Only the lines requested are read from the files
+        assert mf.field_view("ID", slice(9, 11)).tolist() == [b"10   ", b"1    "]
+        assert mf.field_view("ID", slice(0, 20, 9)).tolist() == [b"1    ", b"10   ", b"9    "]
+        assert mf.field_view("ID", [11, -1, 0]).tolist() == [b"22   ", b"10   ", b"1    "]
+        assert len(mf.field_view("ID", [])) == 0
+        with pytest.raises(IndexError):
+            mf.field_view("ID", [20])
+
+        # Subsets and regions pass their lines on to the multi-file
+        subset = mf[[1, 11]]
+        assert subset.field_view("ID").tolist() == [b"2    ", b"22   "]
+        assert subset.field_view("ID", [-1]).tolist() == [b"22   "]
+        assert subset.filter(op("ID") == b"22   ").lines == [1]
+
+        region = mf[9:12]
+        assert region.field_view("ID").tolist() == [b"10   ", b"1    ", b"22   "]
+        assert region.field_view("ID", slice(None, None, -1)).tolist() == [b"22   ", b"1    ", b"10   "]
+        assert region.field_view("ID", [2, 0]).tolist() == [b"22   ", b"10   "]
+        assert region.filter(op("ID") < b"2").lines == [0, 1]
+        assert region[[2, 0]].field_view("ID").tolist() == [b"22   ", b"10   "]
+
+
+def test_unique_small_views(monkeypatch):
+    with fwf_open(DataFile, [DATA_1, DATA_2]) as mf:
+        # Only the lines of the view are read from the files
+        sizes = []
+        field_view = FWFFile.field_view
+        def counting_field_view(self, field, lines=None):
+            rtn = field_view(self, field, lines)
+            sizes.append(len(rtn))
+            return rtn
+
+        monkeypatch.setattr(FWFFile, "field_view", counting_field_view)
+
+        assert sorted(mf[[1, 11, 13]].unique("ID")) == [b"2    ", b"22   ", b"4    "]
+        assert sorted(mf[9:12].unique("ID", "changed")) == [
+            (b"1    ", b" 20180101"), (b"10   ", b" 20181001"), (b"22   ", b" 20180201")]
+        assert max(sizes) <= 2
+
+
+@pytest.mark.parametrize("numpy_path", [True, False])
+def test_unique_nul_bytes(monkeypatch, numpy_path):
+    data = DATA_1.replace(b"\n2    ", b"\n2\x00\x00\x00\x00").replace(b"\n3    ", b"\n3 \x00\x00\x00")
+    if not numpy_path:
+        monkeypatch.setattr(FWFMultiFile, "field_view", lambda self, field, lines=None: None)
+
+    with fwf_open(DataFile, [data, DATA_2]) as mf:
+        # Trailing NUL bytes are retained, with and without numpy
+        rtn = mf.unique("ID")
+        assert b"2\x00\x00\x00\x00" in rtn
+        assert b"3 \x00\x00\x00" in rtn
+        assert b"2" not in rtn
+        assert all(len(x) == 5 for x in rtn)
+
+        rtn = mf[[1, 2, 11]].unique("ID", "changed")
+        assert sorted(rtn) == [
+            (b"2\x00\x00\x00\x00", b" 20180201"), (b"22   ", b" 20180201"), (b"3 \x00\x00\x00", b" 20180301")]
+
+
+@pytest.mark.parametrize("builder", [FWFSimpleIndexBuilder, FWFCythonIndexBuilder])
+def test_cython_index(builder):
     with fwf_open(DataFile, [DATA_1, DATA_2]) as mf:
         assert isinstance(mf, FWFMultiFile)
         mi = FWFIndexDict(mf)
-        FWFSimpleIndexBuilder(mi).index(mf, "ID")
+        builder(mi).index(mf, "ID")
         assert len(mi) == 11
 
         assert len(mi[b"1    "]) == 2
@@ -206,23 +253,26 @@ def test_cython_index():
         assert mi[b"2    "][0].rooted().lineno == 1
         assert mi[b"22   "][0].rooted().lineno == 1
 
-        # TODO same tests, different index implementation => restructure
-        mi = FWFIndexDict(mf)
-        FWFCythonIndexBuilder(mi).index(mf, "ID")
-        assert len(mi) == 11
 
-        assert len(mi[b"1    "]) == 2
-        assert len(mi[b"22   "]) == 1
+def test_cython_index_with_filters():
+    with fwf_open(DataFile, [DATA_1, DATA_2]) as mf:
+        filters = fwf_db_cython.FWFFilters(mf.files[0])
+        filters.add_filter_2("changed", b" 20180501", upper=True, equal=True)
 
-        assert mi[b"1    "][0].rooted().parent == mf.files[0]
-        assert mi[b"1    "][1].rooted().parent == mf.files[1]
-        assert mi[b"2    "][0].rooted().parent == mf.files[0]
-        assert mi[b"22   "][0].rooted().parent == mf.files[1]
+        mi = FWFIndexDict(mf)
+        FWFCythonIndexBuilder(mi).index(mf, "ID", filters=filters)
+        assert len(mi) == 6         # 1, 2, 3, 4, 5 and 22
+        assert [x.rooted(mf).lineno for x in mi[b"1    "]] == [0, 10]
+        assert [x.rooted(mf).lineno for x in mi[b"22   "]] == [11]
+        assert b"6    " not in mi
 
-        assert mi[b"1    "][0].rooted().lineno == 0
-        assert mi[b"1    "][1].rooted().lineno == 0
-        assert mi[b"2    "][0].rooted().lineno == 1
-        assert mi[b"22   "][0].rooted().lineno == 1
+        mi = FWFIndexDict(mf)
+        FWFCythonIndexBuilder(mi, fixed_bytes=True).index(mf, "ID", filters=filters)
+        assert isinstance(mi.data, FixedBytesDictWithIntListValues)
+        assert mi.data.finalized
+        assert len(mi.data.data) == sum(len(x) for x in mi.data.values()) + 1
+        assert len(mi) == 6
+        assert [x.rooted(mf).lineno for x in mi[b"1    "]] == [0, 10]
 
 
 def test_cython_unique_index():
@@ -11,15 +11,17 @@ Run individual tests like:
   pytest -svx -m "slow" <script.py>::<func name>
 """
 
-from io import TextIOWrapper
-from random import randrange
+from io import BufferedWriter
+import sys
+import mmap
+import random
+import struct
 from time import time
 from collections import defaultdict
 import datetime
-import inspect
+import tracemalloc
 
 import numpy as np
-import pandas as pd
 
 import pytest
 
@@ -29,10 +31,12 @@ from fwf_db import FWFLine
 from fwf_db import op
 from fwf_db._cython import fwf_db_cython
 from fwf_db import FWFIndexDict, FWFUniqueIndexDict
+from fwf_db import FWFSortedIndex, FWFSortedIndexBuilder
 from fwf_db import FWFCythonIndexBuilder
 from fwf_db.core import FWFNumpyIndexBuilder
 from fwf_db.core import FWFSimpleIndexBuilder
 from fwf_db import BytesDictWithIntListValues
+from fwf_db import FixedBytesDictWithIntListValues
 
 # ---------------------------------------------
 # Performance Log
@@ -44,10 +48,12 @@ LOG = None
 def setup_module(module):   # pylint: disable=unused-argument
     """ setup any state specific to the execution of the given module."""
     global LOG      # pylint: disable=global-statement
-    LOG = open("./logs/performance.log", "at", encoding="utf-8")
+    # Binary with a large buffer: nothing is written (or encoded by a
+    # TextIOWrapper) in between the timed sections, only on close.
+    LOG = open("./logs/performance.log", "ab", buffering=1 << 20)
     now = datetime.datetime.now()
     dt = now.strftime("%Y-%m-%d %H:%M:%S")
-    LOG.write(f"{{ date: {dt}, ")
+    LOG.write(f"{{ date: {dt}, ".encode("utf-8"))
 
 
 # Pytest fixture to teardown the module
@@ -55,21 +61,23 @@ def teardown_module(module):    # pylint: disable=unused-argument
     """ teardown any state that was previously setup with a setup_module
     method.
     """
-    assert isinstance(LOG, TextIOWrapper)
-    LOG.write("}\n")
+    assert isinstance(LOG, BufferedWriter)
+    LOG.write(b"}\n")
     LOG.close()
 
 
 def log(t1, suffix=None):
     elapsed = time() - t1
-    me = inspect.stack()[1][3]
+    # The caller's function name. inspect.stack() would walk (and resolve
+    # the source files of) all frames.
+    me = sys._getframe(1).f_code.co_name     # pylint: disable=protected-access
     if suffix is not None:
         me = me + "-" + suffix
 
     if LOG is not None:
-        assert isinstance(LOG, TextIOWrapper)
+        assert isinstance(LOG, BufferedWriter)
 
-        LOG.write(f'{me}: {elapsed}, ')
+        LOG.write(f'{me}: {elapsed}, '.encode("utf-8"))
 
     print(f'{me}: Elapsed time is {elapsed} seconds.')
 
@@ -142,18 +150,82 @@ def test_perf_iter_lines():
     fwf = FWFFile(CENT_PARTY)
     with fwf.open(FILE_CENT_PARTY) as fd:
         assert len(fd) == 5_889_278   # The file is 2GB and has 5.8 mio records
+        fd.madvise(mmap.MADV_SEQUENTIAL)
+        fd.prefetch()
 
-        # Just read line by line and return the bytes
+        # Just read line by line and return the bytes.
+        # No per-line asserts: we want to time the iteration, not the interpreter.
         t1 = time()
-        i = 0
-        for i, line in enumerate(fd.iter_lines()):
-            assert line
-
-        assert (i + 1) == len(fd)
+        i = -1
+        for i, _ in enumerate(fd.iter_lines()):
+            pass
 
         # Between 2.88 and 8 secs (first invocation)
         # My SDD shows almost no signs of being busy => CPU constraint
         log(t1)
+        assert (i + 1) == len(fd)
+
+        # The baseline: reading (touching) every line in C, without creating
+        # any python objects. The difference to the above is interpreter overhead.
+        t1 = time()
+        fwf_db_cython.drain(fwf)
+        log(t1, "drain")
+
+        # Same scan, but in Cython: no Python object per line, only the
+        # line numbers are collected.
+        t1 = time()
+        rtn = fwf_db_cython.line_numbers(fwf)
+        assert len(rtn) == len(fd)
+        log(t1, "cython")
+
+        # Pre-fetch (MADV_WILLNEED) the next block of lines while iterating
+        # over the current one.
+        block = 100_000
+        t1 = time()
+        for start in range(0, len(fd), block):
+            fd.madvise(mmap.MADV_WILLNEED, start + block, start + 2 * block)
+            for _ in fd[start : start + block].iter_lines():
+                pass
+
+        log(t1, "willneed")
+
+
+def read_chunks(file: str, start_pos: int, fwidth: int, chunk_bytes: int = 16 << 20):
+    """Read the file (whole lines only) chunk by chunk into one fixed-size
+    buffer, rather then mapping all of it into memory. The memoryviews
+    returned are only valid until the next chunk has been read."""
+
+    buf = bytearray(max(chunk_bytes // fwidth, 1) * fwidth)
+    view = memoryview(buf)
+    with open(file, "rb", buffering=0) as fd:
+        fd.seek(start_pos)
+        while True:
+            # Regular files return short reads only at the end of the file
+            count = fd.readinto(buf)
+            if not count:
+                break
+
+            yield view[:count]
+
+
+@pytest.mark.slow
+def test_perf_iter_lines_read_chunks():
+
+    fwf = FWFFile(CENT_PARTY)
+    with fwf.open(FILE_CENT_PARTY) as fd:
+        start_pos, fwidth = fd.start_pos, fd.fwidth
+
+    # No mmap, no page faults: read 16 MB at a time (with cold caches, this
+    # may be faster then the mmap) and apply the same Cython scan to each chunk.
+    t1 = time()
+    count = 0
+    chunk = FWFFile(CENT_PARTY, comments="")
+    for data in read_chunks(FILE_CENT_PARTY, start_pos, fwidth):
+        with chunk.open(data):
+            count += len(fwf_db_cython.line_numbers(chunk))
+
+    assert count == 5_889_278
+    log(t1)
 
 
 @pytest.mark.slow
@@ -167,7 +239,7 @@ def test_perf_iter_fwfline():
         t1 = time()
         line = None
         for line in fd:
-            assert line
+            pass
 
         assert isinstance(line, FWFLine)
         assert (line.lineno + 1) == len(fd)
@@ -241,19 +313,53 @@ def test_dict_fromkeys():
         log(t1, "2.6 use dict-comprehension() to create dict with zero")     # approx 6-7 secs
 
 
+def sample_keys(index, count: int) -> list:
+    """'count' random keys (with repetitions) of the index, in random order.
+
+    Rather then a list with all keys of the index (millions), only the
+    keys at the random positions are collected while iterating the keys once.
+    tolist() converts the positions in one go, rather then one numpy
+    scalar at a time.
+    """
+    positions, repeats = np.unique(np.random.randint(0, len(index), count), return_counts=True)
+    wanted = dict(zip(positions.tolist(), repeats.tolist()))
+    keys = [key for i, key in enumerate(index.keys()) if i in wanted for _ in range(wanted[i])]
+    random.shuffle(keys)
+    return keys
+
+
 def access_index_many_time(index, count, logmsg):
-    idx = list(index.keys())   # dict[Any, list[int]]
-    len_index = len(idx)
+    # Determine the keys upfront, so that only the lookups are timed.
+    keys = sample_keys(index, int(count))
+
     t1 = time()
-    for _ in range(int(count)):
-        key =  randrange(len_index)
-        key = idx[key]
+    for key in keys:
         refs = index[key]
-        assert refs
+        assert refs is not None
 
     # Elapsed time is 6.269562721252441 seconds.
     log(t1, logmsg)
 
+    # The same lookups as one batch: map() loops in C and calls __getitem__
+    # directly. What remains is the time spent in the index itself.
+    t1 = time()
+    refs = list(map(index.__getitem__, keys))
+    assert len(refs) == len(keys)
+    log(t1, logmsg + "_batch")
+
+    # Only the key lookups, without creating the views (FWFLine, FWFSubset)
+    t1 = time()
+    assert all(map(index.__contains__, keys))
+    log(t1, logmsg + "_contains")
+
+    # All lookups in one go (numpy), if the index supports it
+    lookup_batch = getattr(index, "lookup_batch", None)
+    if lookup_batch is not None:
+        t1 = time()
+        starts, ends = lookup_batch(keys)
+        assert np.all(ends > starts)
+        log(t1, logmsg + "_vectorized")
+
 
 def exec_perf_index(index_dict, index_builder, log_1, log_2):
 
@@ -262,6 +368,7 @@ def exec_perf_index(index_dict, index_builder, log_1, log_2):
         assert len(fd) == 5_889_278
 
         # Create an index on PARTY_ID, using the optimized field reader (no FWFLine object)
+        fd.madvise(mmap.MADV_SEQUENTIAL)
         t1 = time()
         index = index_dict(fd)
         index_builder(index).index(fd, "PARTY_ID")
@@ -270,6 +377,9 @@ def exec_perf_index(index_dict, index_builder, log_1, log_2):
         # 10 - 15 secs to create the index
         log(t1, log_1)
 
+        # The lookups access the lines in random order
+        fd.madvise(mmap.MADV_RANDOM)
+
         # Access lines randomly 1 mio times
         # Elapsed time is 6.269562721252441 seconds.
         access_index_many_time(index, 1e6, log_2)
@@ -280,33 +390,72 @@ def test_perf_simple_index():
     exec_perf_index(FWFIndexDict, FWFSimpleIndexBuilder, "FWFSimpleIndexBuilder", "FWFIndexDict_1mio_random_lookups")
     exec_perf_index(FWFIndexDict, FWFNumpyIndexBuilder, "FWFNumpyIndexBuilder", "FWFIndexDict_1mio_random_lookups")
     exec_perf_index(FWFIndexDict, FWFCythonIndexBuilder, "FWFCythonIndexBuilder", "FWFIndexDict_1mio_random_lookups")
+    # PARTY_ID is unique: no need for a dict (of lists). Sort once and binary search.
+    exec_perf_index(FWFSortedIndex, FWFSortedIndexBuilder, "FWFSortedIndexBuilder", "FWFSortedIndex_1mio_random_lookups")
+
+
+def format_right_aligned(values, width: int):
+    """Same as bytes(f"{value:>{width}}") for every (positive) int value, but
+    one digit position at a time for all values, writing straight into a
+    (N, width) byte block, which then is viewed as 'S<width>' array.
+    """
+    out = np.full((len(values), width), ord(" "), dtype=np.uint8)
+    values = values.copy()
+    for i in range(width - 1, -1, -1):
+        digits = (values % 10 + ord("0")).astype(np.uint8)
+        mask = values > 0
+        if i == width - 1:
+            mask[:] = True      # The value 0 is "0", not blank
+
+        out[mask, i] = digits[mask]
+        values //= 10
+
+    return out.view(f"S{width}").ravel()
+
+
+def dict_of_lists(values) -> dict:
+    """Create an "index" dict[Any, list[int]] in a tight loop: setdefault avoids
+    the defaultdict __missing__ round trip, and the bound methods are looked
+    up only once."""
+    rtn = {}
+    setdefault = rtn.setdefault
+    append = list.append
+    for i, value in enumerate(values):
+        append(setdefault(value, []), i)
+
+    return rtn
 
 
 @pytest.mark.slow
 def test_numpy_samples():
     # Preparation: create 10 mio random string entries (10 bytes)
     reclen = int(10e6)
-    values = np.empty(reclen, dtype="S10")
 
     t1 = time()
     flen = int(reclen / 15)     # Make sure we create some duplicates
-    for i in range(reclen):
-        value = randrange(flen)
-        value = bytes(f"{value:>10}", "utf-8")
-        values[i] = value
+    values = format_right_aligned(np.random.randint(0, flen, reclen), 10)
 
-    # Approx 16 secs
+    # Approx 16 secs, when formatting value by value
     log(t1, "Preparation-Create_random_entries")
 
     # Create an "index" with defaultdict(list) (dict[Any, list[int]])
     t1 = time()
     data = defaultdict(list)
-    all(data[value].append(i) or True for i, value in enumerate(values))
+    for i, value in enumerate(values):
+        data[value].append(i)
     log(t1, "Create-defaultlist(list)-index")   # Approx 8.2 secs
 
     # Approx 1.2 secs
     access_index_many_time(data, 1e6, "defaultdict_1mio_random_lookups")
 
+    # Same with a plain dict and setdefault(). tolist() converts the numpy
+    # array in one go, rather then creating numpy scalars one by one.
+    t1 = time()
+    data = dict_of_lists(values.tolist())
+    log(t1, "Create-dict.setdefault-index")
+
+    access_index_many_time(data, 1e6, "dict.setdefault_1mio_random_lookups")
+
     # Create an "index" with FWFDict (dict[Any, list[int]])
     t1 = time()
     data = FWFDict()
@@ -317,6 +466,42 @@ def test_numpy_samples():
     # A tiny bit slower then defaultdict(list) !!!
     access_index_many_time(data, 1e6, "FWFDict_1mio_random_lookups")
 
+    # Create a CSR-like "index" with numpy only: the sorted unique keys, and
+    # for each key a range (offsets) into one array with all the line numbers.
+    # A single stable sort: equal keys are adjacent and in file order.
+    t1 = time()
+    linenos = np.argsort(values, kind="stable")
+    sorted_values = values[linenos]
+    starts = np.flatnonzero(sorted_values[1:] != sorted_values[:-1]) + 1
+    offsets = np.concatenate(([0], starts, [len(values)]))
+    keys = sorted_values[offsets[:-1]]
+    log(t1, "Create-numpy-CSR-index")
+
+    # The same groups, but as dict (key => numpy array with the line numbers),
+    # if a dict API is needed.
+    t1 = time()
+    data = dict(zip(keys.tolist(), np.split(linenos, starts)))
+    log(t1, "Create-numpy-split-dict-index")
+
+    access_index_many_time(data, 1e6, "numpy_split_dict_1mio_random_lookups")
+
+    lookups = keys[np.random.randint(0, len(keys), int(1e6))]
+    t1 = time()
+    for key in lookups:
+        pos = np.searchsorted(keys, key)
+        refs = linenos[offsets[pos] : offsets[pos + 1]]
+        assert len(refs)
+
+    log(t1, "numpy_CSR_1mio_random_lookups")
+
+    # All lookups in one go: a single (vectorized) binary search
+    t1 = time()
+    pos = np.searchsorted(keys, lookups)
+    assert np.all(keys[pos] == lookups)
+    counts = offsets[pos + 1] - offsets[pos]
+    assert np.all(counts > 0)
+    log(t1, "numpy_CSR_1mio_batch_lookups")
+
 
 @pytest.mark.slow
 def test_effective_date_simple_filter():
@@ -342,13 +527,20 @@ def test_effective_date_region_filter():
         t1 = time()
         # NOTE: you cannot combine the operators with AND resp. OR. It is always AND.
         # Identify all entries which started at or before 20130101 and ended at or after 20131231
-        fd = fd.filter(op("VALID_FROM") <= b"20130101")
-        fd = fd.filter(op("VALID_UNTIL") >= b"20131231")
-        assert len(fd) == 1_293_435
+        rtn = fd.filter(op("VALID_FROM") <= b"20130101")
+        rtn = rtn.filter(op("VALID_UNTIL") >= b"20131231")
+        assert len(rtn) == 1_293_435
 
         # 21 secs, compared to 18 secs for only 1 filter
         log(t1)
 
+        # Both filters in one call: one mask, updated in place, and if only
+        # few lines pass the first filter, the second reads only these lines.
+        t1 = time()
+        rtn = fd.filter(op("VALID_FROM") <= b"20130101", op("VALID_UNTIL") >= b"20131231")
+        assert len(rtn) == 1_293_435
+        log(t1, "fused filters")
+
 
 @pytest.mark.slow
 def test_effective_date_region_filter_optimized():
@@ -372,12 +564,136 @@ def test_effective_date_region_filter_optimized():
             return line[valid_until_slice] >= b"20131231"
 
         t1 = time()
-        fd = fd.filter(region_filter)
-        assert len(fd) == 1_293_435
+        rtn = fd.filter(region_filter)
+        assert len(rtn) == 1_293_435
 
         # 20 sec; No differnce with FWFOperators
         log(t1)
 
+        # The 8 digit dates as big-endian uint64 have the same order as the
+        # bytes. No slice (memoryview) per field, and a plain int comparison.
+        unpack = struct.Struct(">Q").unpack_from
+        valid_from_pos = valid_from_slice.start
+        valid_until_pos = valid_until_slice.start
+        from_date = int.from_bytes(b"20130101", "big")
+        until_date = int.from_bytes(b"20131231", "big")
+
+        def region_filter_uint64(line):
+            if unpack(line, valid_from_pos)[0] > from_date:
+                return False
+
+            if line[valid_until_last_pos] == 32:
+                return True
+
+            return unpack(line, valid_until_pos)[0] >= until_date
+
+        # The raw lines, rather then FWFLine objects
+        t1 = time()
+        rtn = [i for i, line in enumerate(fd.iter_lines()) if region_filter_uint64(line)]
+        assert len(rtn) == 1_293_435
+
+        log(t1, "uint64")
+
+
+@pytest.mark.slow
+def test_effective_date_region_filter_cython():
+    fwf = FWFFile(CENT_PARTY)
+    with fwf.open(FILE_CENT_PARTY) as fd:
+        assert len(fd) == 5_889_278
+
+        # Same as above, but the filter is applied in C, while scanning the file.
+        # Like region_filter, an empty VALID_UNTIL matches.
+        t1 = time()
+        filters = fwf_db_cython.FWFFilters(fwf)
+        filters.add_filter_2("VALID_FROM", "20130101", upper=True, equal=True)
+        filters.add_filter_2("VALID_UNTIL", "20131231", upper=False, equal=True)
+        fd = fd[fwf_db_cython.line_numbers(fwf, filters=filters)]
+        assert len(fd) == 1_293_435
+
+        log(t1)
+
+
+@pytest.mark.slow
+def test_effective_date_region_filter_and_index():
+    fwf = FWFFile(CENT_PARTY)
+    with fwf.open(FILE_CENT_PARTY) as fd:
+        assert len(fd) == 5_889_278
+
+        # Filter and index in the same pass over the file, rather then
+        # filtering first and then reading the filtered lines again.
+        t1 = time()
+        filters = fwf_db_cython.FWFFilters(fwf)
+        filters.add_filter_2("VALID_FROM", "20130101", upper=True, equal=True)
+        filters.add_filter_2("VALID_UNTIL", "20131231", upper=False, equal=True)
+        index = FWFIndexDict(fd)
+        FWFCythonIndexBuilder(index).index(fd, "PARTY_ID", filters=filters)
+        assert sum(len(refs) for refs in index.data.values()) == 1_293_435
+
+        log(t1)
+
+
+def effective_date_mask(valid_from, valid_until, from_date: bytes, until_date: bytes):
+    """Same as region_filter, but for the (S8) date columns of all lines at
+    once. An empty VALID_UNTIL (last byte is blank) matches as well. Since
+    "    " < "20130101" VALID_FROM needs no extra test.
+    """
+    # The last byte of every value, as (zero-copy) uint8 view. Cheaper
+    # then np.char.endswith(valid_until, b" ")
+    last_byte = valid_until[:, None].view(np.uint8)[:, -1]
+
+    mask = valid_until >= until_date
+    mask |= last_byte == ord(" ")
+    mask &= valid_from <= from_date
+    return mask
+
+
+@pytest.mark.slow
+def test_effective_date_region_filter_vectorized():
+    fwf = FWFFile(CENT_PARTY)
+    with fwf.open(FILE_CENT_PARTY) as fd:
+        assert len(fd) == 5_889_278
+
+        # Same as above, but with numpy, comparing all lines at once
+        t1 = time()
+        valid_from = fd.field_view("VALID_FROM")
+        valid_until = fd.field_view("VALID_UNTIL")
+        mask = effective_date_mask(valid_from, valid_until, b"20130101", b"20131231")
+        valid_from = valid_until = None     # Release the views on the mmap
+
+        rtn = fd[mask]
+        assert len(rtn) == 1_293_435
+
+        log(t1)
+
+        # Copy the 2 date columns (approx 100 MB) once. Every later filter on
+        # them reads only these, rather then the whole 2 GB file.
+        t1 = time()
+        fd.materialize_columns("VALID_FROM", "VALID_UNTIL")
+        log(t1, "materialize")
+
+        t1 = time()
+        mask = effective_date_mask(fd.field_view("VALID_FROM"), fd.field_view("VALID_UNTIL"), b"20130101", b"20131231")
+        rtn = np.flatnonzero(mask)
+        assert len(rtn) == 1_293_435
+
+        log(t1, "columns")
+
+        # The dates as int32 columns (parsed once in Cython): 4 rather then 8
+        # bytes per value, and a single int comparison. Empty dates are 0.
+        t1 = time()
+        valid_from = fwf_db_cython.field_data(fwf, "VALID_FROM", int_value=True)
+        valid_until = fwf_db_cython.field_data(fwf, "VALID_UNTIL", int_value=True)
+        log(t1, "int32 columns")
+
+        t1 = time()
+        mask = valid_until >= 20131231
+        mask |= valid_until == 0
+        mask &= valid_from <= 20130101
+        rtn = np.flatnonzero(mask)
+        assert len(rtn) == 1_293_435
+
+        log(t1, "int32")
+
 
 @pytest.mark.slow
 def test_cython_filter():
@@ -396,6 +712,13 @@ def test_cython_filter():
         assert len(rtn) == 1_293_435
         log(t1)       # 1.2 secs   # Yes !!!!
 
+        # The scan does not hold the GIL. Split the file into chunks and
+        # scan them in parallel threads.
+        t1 = time()
+        rtn = fwf_db_cython.line_numbers(fwf, filters=filters, threads=None)
+        assert len(rtn) == 1_293_435
+        log(t1, "threads")
+
 
 @pytest.mark.slow
 def test_cython_get_field_data():
@@ -410,10 +733,66 @@ def test_cython_get_field_data():
         # In run mode:
         # 1.85 secs, Cython really makes a difference
 
+        # Same contiguous 'S10' column, but copied by numpy from the strided
+        # (zero-copy) view onto the mmap.
+        t1 = time()
+        rtn = np.ascontiguousarray(fd.field_view("PARTY_ID"))
+        print(f'numpy: Elapsed time is {time() - t1} seconds.    {len(rtn):,d}')
+
 
 def my_find_last(data):
-    _, indices = np.unique(data[::-1], return_index=True)
-    return indices[::-1]
+    """For every distinct value, return the index of its last occurrence.
+
+    Single linear pass; the dict is built in C, and later entries simply replace
+    earlier ones. Previously np.unique() was used, which sorts all values.
+    """
+    last = dict(zip(data.tolist(), range(len(data))))
+    return np.fromiter(last.values(), dtype=np.int64, count=len(last))
+
+
+def last_per_group(data):
+    """For every distinct value, return the index of its last occurrence
+    (ordered by value). A stable sort keeps equal values in file order, hence
+    the last entry of each group is the last occurrence.
+    """
+    order = np.argsort(data, kind="stable")
+    if len(order) == 0:
+        return order
+
+    values = data[order]
+    last = np.append(np.flatnonzero(values[1:] != values[:-1]), len(values) - 1)
+    return order[last]
+
+
+def build_chain(data):
+    """Hash fixed-width byte keys into 'buckets' and link entries with the
+    same hash (head/next int32 chains; -1 is end-of-chain). buckets[h] is the
+    last entry with hash h, and next[i] the previous entry with the same hash.
+
+    The polynomial hash and the chains are computed column-by-column with
+    numpy, rather then in a loop per key.
+    """
+    count = len(data)
+    width = data.dtype.itemsize
+    cap = 1 << (count.bit_length() + 1)
+    view = np.frombuffer(np.ascontiguousarray(data), dtype=np.uint8).reshape(count, width)
+
+    hashes = np.zeros(count, dtype=np.uint64)
+    for i in range(width):
+        hashes = hashes * np.uint64(31) + view[:, i]
+    hashes &= np.uint64(cap - 1)
+
+    order = np.argsort(hashes, kind="stable")
+    sorted_hashes = hashes[order]
+    same = np.append(False, sorted_hashes[1:] == sorted_hashes[:-1])
+
+    nxt = np.full(count, -1, dtype=np.int32)
+    nxt[order[same]] = order[np.flatnonzero(same) - 1]
+
+    last = np.append(np.flatnonzero(~same[1:]), count - 1)
+    buckets = np.full(cap, -1, dtype=np.int32)
+    buckets[sorted_hashes[last]] = order[last]
+    return buckets, nxt
 
 
 @pytest.mark.slow
@@ -445,25 +824,31 @@ def test_find_last():
         rtn = fwf_db_cython.field_data(fwf, "PARTY_ID")
         print(f'2. Elapsed time is {time() - t1} seconds.')
 
-        # field_data() returns a numpy array. Use numpy to determine the last for each key.
+        # 1. and 2. in a single pass over the file
+        t1 = time()
+        index = FWFUniqueIndexDict(fwf)
+        rtn = fwf_db_cython.field_data_and_index(fwf, "PARTY_ID", index)
+        print(f'2b. Elapsed time is {time() - t1} seconds. {len(index):,d} keys, {len(rtn):,d} values')
+
+        # field_data() returns a numpy array. Determine the last for each key.
         # Since PARTY_ID is unique, the return array is unchanged.
-        # approx 3-4 secs
+        # approx 3-4 secs with np.unique()
         indices = my_find_last(rtn)
         is_unique = len(indices) == len(fd)
         print(f'3. Elapsed time is {time() - t1} seconds. {len(indices):,d} - {"unique" if is_unique else "not unique"} index')
 
-        # Searching these data in Numpy/Pandas is really slow.
-        # 4.7 secs for only 10_000 lookups !!
-        df = pd.DataFrame(indices, columns=["values"])
-        df["index"] = df.index
-        df = df.set_index("values")
+        # Searching these data with Pandas (df.iloc / df.loc) was really slow.
+        # 4.7 secs for only 10_000 lookups !! Sorted keys with a batch of
+        # lookups via np.searchsorted() avoid the per-lookup overhead.
+        order = np.argsort(rtn[indices])
+        keys = rtn[indices][order]
+        linenos = indices[order]
 
+        lookups = rtn[np.random.randint(0, len(rtn), 1_000_000)]
         t1 = time()
-        for _ in range(int(10_000)):
-            key =  randrange(len(rtn))
-            key = df.iloc[key]
-            refs = df.loc[key]
-            assert refs is not None
+        pos = np.searchsorted(keys, lookups)
+        refs = linenos[pos]
+        assert np.all(rtn[refs] == lookups)
 
         print(f'4. Elapsed time is {time() - t1} seconds.')
 
@@ -477,12 +862,17 @@ def test_find_last():
         is_unique = len(values) == len(fd)
         print(f'5. Elapsed time is {time() - t1} seconds. {len(values):,d} - {"unique" if is_unique else "not unique"} index')
 
-        # First we tested Numpy to create the index, then a dict, and now Pandas groupby.
-        # approx 22 secs
-        df = pd.DataFrame(rtn, columns=["values"])
-        df = df.groupby("values").tail(1)
-        is_unique = len(df.index) == len(fd)
-        print(f'6. Elapsed time is {time() - t1} seconds. {len(df.index):,d} - {"unique" if is_unique else "not unique"} index')
+        # First we tested Numpy to create the index, then a dict, and then Pandas
+        # groupby().tail(1) (approx 22 secs). Sorting and taking the last entry of
+        # each group of equal keys is the same, but without the Pandas overhead.
+        indices = last_per_group(rtn)
+        is_unique = len(indices) == len(fd)
+        print(f'6. Elapsed time is {time() - t1} seconds. {len(indices):,d} - {"unique" if is_unique else "not unique"} index')
+
+        # Hash table with int32 head/next chains, all built with numpy
+        t1 = time()
+        buckets, nxt = build_chain(rtn)
+        print(f'7. Elapsed time is {time() - t1} seconds. {np.count_nonzero(buckets >= 0):,d} buckets, {np.count_nonzero(nxt >= 0):,d} collisions')
 
 
 
@@ -496,11 +886,49 @@ def test_numpy_sort():
         rtn = fwf_db_cython.field_data(fwf, "PARTY_ID")
         print(f'Elapsed time is {time() - t1} seconds.')
 
-        rtn = np.argsort(rtn)
+        data = rtn
+        rtn = np.argsort(data)
         print(f'Elapsed time is {time() - t1} seconds. {len(rtn):,d}')
 
         # approx 2-3 secs to sort
 
+        t1 = time()
+        rtn = radix_argsort(data)
+        print(f'radix sort: Elapsed time is {time() - t1} seconds. {len(rtn):,d}')
+
+        t1 = time()
+        rtn = blocked_argsort(data)
+        print(f'blocked sort: Elapsed time is {time() - t1} seconds. {len(rtn):,d}')
+
+
+def blocked_argsort(values, block: int = 256 * 1024):
+    """Sort blocks which fit into the CPU cache (256K x S10 = 2.5 MB) and then
+    merge the sorted blocks. For strings, numpy's stable sort is a timsort,
+    which detects the sorted runs and merges them, without a python-level merge.
+    """
+    rtn = np.empty(len(values), dtype=np.int64)
+    for start in range(0, len(values), block):
+        stop = start + block
+        rtn[start:stop] = np.argsort(values[start:stop]) + start
+
+    return rtn[np.argsort(values[rtn], kind="stable")]
+
+
+def radix_argsort(values):
+    """LSD radix sort of a 'S<n>' numpy array, digit by digit starting with the
+    last one. Numpy's stable sort on uint8 and uint16 already is a radix sort
+    (no comparisons), hence linear passes rather than O(N log N) string compares.
+    If the length is even, 2 bytes (big-endian uint16) are one digit, which
+    halves the number of passes, e.g. 5 for S10.
+    """
+    dtype = ">u2" if values.itemsize % 2 == 0 else np.uint8
+    data = np.ascontiguousarray(values).view(dtype).reshape(len(values), -1)
+    rtn = np.arange(len(values))
+    for i in range(data.shape[1] - 1, -1, -1):
+        rtn = rtn[np.argsort(data[rtn, i], kind="stable")]
+
+    return rtn
+
 
 @pytest.mark.slow
 def test_cython_create_index():
@@ -508,16 +936,15 @@ def test_cython_create_index():
     with fwf.open(FILE_CENT_PARTY) as fd:
         assert len(fd) == 5_889_278
 
-        # Create a non-unique index with defaultdict(list).
+        # Create a non-unique index with dict.setdefault().
         # PARTY_ID is unique, hence the test does not consider the non-unique use cases
         t1 = time()
         rtn = fwf_db_cython.field_data(fwf, "PARTY_ID")
         print("")
         print(f'1. read field_data: Elapsed time is {time() - t1} seconds.')     # approx 2 secs
 
-        values = defaultdict(list)
-        all(values[value].append(i) or True for i, value in enumerate(rtn))
-        print(f'2. defaultdict(list): Elapsed time is {time() - t1} seconds.    {len(rtn):,d}')    # approx 10 secs
+        values = dict_of_lists(rtn)
+        print(f'2. dict.setdefault(): Elapsed time is {time() - t1} seconds.    {len(rtn):,d}')    # approx 10 secs
 
         t1 = time()
         rtn = fwf_db_cython.field_data(fwf, "PARTY_ID")
@@ -580,13 +1007,18 @@ def test_int_index():
         fwf_db_cython.create_index(fwf, "PARTY_ID", index, func=int)
         print(f'2. Elapsed time is {time() - t1} seconds.')
 
-        # Create a defaultdict(list) with integer keys
+        # Create a dict[int, list[int]] with integer keys
         rtn = fwf_db_cython.field_data(fwf, "PARTY_ID")
-        values = defaultdict(list)
-        all(values[int(value)].append(i) or True for i, value in enumerate(rtn))
+        values = dict_of_lists(map(int, rtn))
         print(f'3. Elapsed time is {time() - t1} seconds.    {len(index):,d}')
 
 
+def traced_mb() -> str:
+    """The memory currently allocated, and the peak, in MB (see tracemalloc)"""
+    current, peak = tracemalloc.get_traced_memory()
+    return f"{current / 1e6:,.0f} (peak: {peak / 1e6:,.0f})"
+
+
 @pytest.mark.slow
 def test_merge_unique_index():
     # PARTY_ID has no duplicate value in the file
@@ -595,35 +1027,46 @@ def test_merge_unique_index():
     with fwf.open(FILE_CENT_PARTY) as fd:
         assert len(fd) == 5_889_278
 
+        # Speed is only one aspect. Also report the memory allocated for each
+        # index variant (numpy arrays are traced as well).
+        tracemalloc.start()
+
         t1 = time()
         index = FWFUniqueIndexDict(fwf)
         fwf_db_cython.create_index(fwf, "PARTY_ID", index)
         fwf_db_cython.create_index(fwf, "PARTY_ID", index)
         print("")
-        print(f'1. Elapsed time is {time() - t1} seconds.    {len(index):,d}')
+        print(f'1. Elapsed time is {time() - t1} seconds.    {len(index):,d}    {traced_mb()} MB')
         assert len(fd) == len(index)
 
         # Unique index with plain dict
         # approx 20 seconds
 
         t1 = time()
+        index = None
+        tracemalloc.reset_peak()
         index = FWFIndexDict(fwf)
         fwf_db_cython.create_index(fwf, "PARTY_ID", index)
         fwf_db_cython.create_index(fwf, "PARTY_ID", index)
-        print(f'2. Elapsed time is {time() - t1} seconds.    {len(index):,d}')
+        print(f'2. Elapsed time is {time() - t1} seconds.    {len(index):,d}    {traced_mb()} MB')
         assert len(fd) == len(index)
 
         # Non-unique index with FWFDict
         # approx 40 secs
 
         t1 = time()
+        index = data = None
+        tracemalloc.reset_peak()
         data = BytesDictWithIntListValues(len(fd) * 2)
         index = FWFIndexDict(fwf, data)
         fwf_db_cython.create_index(fwf, "PARTY_ID", index)
         fwf_db_cython.create_index(fwf, "PARTY_ID", index)
-        print(f'3. Elapsed time is {time() - t1} seconds.    {len(index):,d}')
+        data.finish()
+        print(f'3. Elapsed time is {time() - t1} seconds.    {len(index):,d}    {traced_mb()} MB')
         assert len(fd) == len(index)
 
+        tracemalloc.stop()
+
         # non-unique index with mem optimized dict
         # approx 53 secs. Quite a bit slower then defaultdict(list)
 
@@ -656,6 +1099,22 @@ def test_non_unique_index():
         # non-unique index with mem optimized dict
         # approx 40 secs. Quite a bit slower then defaultdict(list)
 
+        # The keys (10 bytes) in a hash table of fixed size slots, rather then a dict
+        t1 = time()
+        data = FixedBytesDictWithIntListValues(len(fd), 10)
+        index = FWFIndexDict(fwf, data)
+        fwf_db_cython.create_index(fwf, "SALES_LOCATION_ID", index)
+        print(f'3. Elapsed time is {time() - t1} seconds.    {len(index):,d}')
+        assert len(index) == 3_152_698
+
+        # Group by sorting: the sorted keys, and the linenos in the same order.
+        # No per-key lists at all, and a key's linenos are a slice (view).
+        t1 = time()
+        index = FWFSortedIndex(fwf)
+        FWFSortedIndexBuilder(index).index(fwf, "SALES_LOCATION_ID")
+        print(f'4. Elapsed time is {time() - t1} seconds.    {len(index):,d}')
+        assert len(index) == 3_152_698
+
 
 if __name__ == "__main__":
     #setup_module(None)